@@ -1,37 +1,146 @@
 # load_config.py
+# ------------------------------------------------------------
+# Single entry point for board/team configuration.
+#
+# • parse_tiles / parse_teams – Google-Sheet CSV rows → config dicts
+#   (shared by tools/sheet_loader.py and tools/csv_to_board.py)
+# • board_settings           – defaults + "board-config" (legacy "board")
+# • validate                 – one pass of structural checks
+# • load / compile           – game-config.json → dicts → BoardModel
+# ------------------------------------------------------------
+from __future__ import annotations
+
 import json
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, List, Tuple
+
+from utils.board_model import BoardModel
+
+BOARD_DEFAULTS: Dict[str, Any] = {
+    "board-width":  1600,
+    "board-height": 900,
+    "tile-size":    100,
+    "player-size":  60,
+}
+
+
+def _bool(x: Any) -> bool:
+    return str(x).strip().lower() in {"1", "true", "yes"}
+
 
 class ETL:
+    # ------------------------------------------------------------------ #
+    # Parsing
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def parse_tiles(rows: List[Dict[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """Board tab rows → tiles dict (tile IDs are tile<row-index>)."""
+        tiles: Dict[str, Dict[str, Any]] = {}
+        for idx, row in enumerate(rows):
+            try:
+                r, c = int(row["row"]), int(row["col"])
+            except (KeyError, ValueError):
+                raise ValueError(f"Row {idx+2}: invalid row/col → {row.get('row')} / {row.get('col')}")
+
+            tiles[f"tile{idx}"] = {
+                "item-name":    (row.get("item-name") or "").strip(),
+                "item-picture": (row.get("item-picture") or "").strip(),
+                "tile-desc":    (row.get("tile-desc") or "").strip(),
+                "coords":       [r, c],
+                "next":         [t.strip() for t in (row.get("nextTiles") or "").split(",") if t.strip()],
+                "points":       int(row.get("points") or 1),
+                "must-hit":     _bool(row.get("must-hit")),
+            }
+        return tiles
+
+    @staticmethod
+    def parse_teams(rows: List[Dict[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """Teams tab rows → teams dict keyed by team name."""
+        teams: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            name = (row.get("team-name") or "").strip()
+            if not name:
+                continue
+            teams[name] = {
+                "name":      name,
+                "members":   [m.strip() for m in (row.get("member-ids") or "").split(";") if m.strip()],
+                "tile":      (row.get("startTile") or "").strip(),
+                "rerolls":   int(row.get("rerolls") or 0),
+                "skips":     int(row.get("skips") or 0),
+                "roleId":    (row.get("roleId") or "").strip(),
+                "last_roll": 0,
+            }
+        return teams
+
+    @staticmethod
+    def board_settings(cfg: Dict[str, Any]) -> Dict[str, Any]:
+        """Defaults overlaid with the config's board section."""
+        board_data = dict(BOARD_DEFAULTS)
+        board_data.update(cfg.get("board", {}))          # legacy key
+        board_data.update(cfg.get("board-config", {}))
+        return board_data
+
+    # ------------------------------------------------------------------ #
+    # Validation
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def validate(board_data: Dict[str, Any],
+                 tiles: Dict[str, Dict[str, Any]],
+                 teams: Dict[str, Dict[str, Any]]) -> None:
+        """Raise ValueError describing every problem found (not just the first)."""
+        errors: List[str] = []
+        if not tiles:
+            errors.append("no tiles defined")
+        if not teams:
+            errors.append("no teams defined")
+
+        for key in ("tile-size", "player-size"):
+            try:
+                if int(board_data[key]) <= 0:
+                    raise ValueError
+            except (KeyError, TypeError, ValueError):
+                errors.append(f"board setting '{key}' must be a positive integer")
+
+        for tid, t in tiles.items():
+            coords = t.get("coords")
+            if (not isinstance(coords, (list, tuple)) or len(coords) != 2
+                    or not all(isinstance(v, int) for v in coords)):
+                errors.append(f"tile '{tid}': coords must be [row, col] integers, got {coords!r}")
+            for nxt in t.get("next", []):
+                if nxt not in tiles:
+                    errors.append(f"tile '{tid}' references missing ID '{nxt}'")
+
+        for name, team in teams.items():
+            if team.get("tile") not in tiles:
+                errors.append(f"team '{name}': start tile '{team.get('tile')}' doesn't exist")
+
+        if errors:
+            raise ValueError("invalid board config:\n  • " + "\n  • ".join(errors))
+
+    # ------------------------------------------------------------------ #
+    # Loading
+    # ------------------------------------------------------------------ #
     @staticmethod
-    def load() -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    def load(path: str | Path = "game-config.json") -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
         """
         Load tiles and teams from game-config.json.
         Returns: (board_data, tiles, teams)
         """
-        config_path = Path("game-config.json")
+        config_path = Path(path)
         if not config_path.is_file():
-            raise FileNotFoundError("game-config.json not found – run tools/csv_to_board.py first")
+            raise FileNotFoundError(f"{config_path} not found – run tools/csv_to_board.py first")
 
         with config_path.open(encoding="utf-8") as f:
             cfg = json.load(f)
 
-        # Default board settings
-        board_data = {
-            "tile-size":    100,
-            "player-size":   40,
-            "board-width": 1920,
-            "board-height": 1080,
-        }
-
-        # Update from file if available
-        board_data.update(cfg.get("board", {}))
-
+        board_data = ETL.board_settings(cfg)
         tiles = cfg.get("tiles", {})
         teams = cfg.get("teams", {})
 
-        if not tiles or not teams:
-            raise ValueError("Missing tiles or teams in game-config.json")
-
+        ETL.validate(board_data, tiles, teams)
         return board_data, tiles, teams
+
+    @staticmethod
+    def compile(board_data: Dict[str, Any],
+                tiles: Dict[str, Dict[str, Any]]) -> BoardModel:
+        return BoardModel.compile(board_data, tiles)
@@ -4,7 +4,8 @@ Copy this block into **main.py** first, then add PART 2 and PART 3 below it.
 """
 from __future__ import annotations
 
-import os, asyncio, random, warnings
+import os, io, asyncio, functools, random, warnings
+from pathlib import Path
 from typing import Dict, Any, List
 
 import discord
@@ -13,9 +14,20 @@ from discord.ext import commands
 import discord.app_commands as appcmd
 
 from load_config import ETL
-from utils.board import generate_board
+from utils.refresh_scheduler import RefreshScheduler
+from utils.render_pool import render_board_png, render_overview_png, render_viewport_png
+from utils.state_store import StateStore
+from utils.team_locks import TeamLocks
 from utils.game_functions import GameUtils
-from utils.grid_preview import render_empty_grid
+from utils.grid_preview import grid_png_bytes
+from utils.board import output_filename, output_format
+from utils.board_model import BoardModel
+from utils.board_diff import BoardDiff, TEAM_STATE_KEYS, diff_board
+from utils.move_index import MoveIndex, build_graph, must_hit_tiles, tile_edges
+from utils.move_history import Move, MoveHistory
+from utils.metrics import METRICS
+from utils.outbound import Outbox
+from utils.image_processor import ImageProcess
 
 warnings.filterwarnings("ignore", category=UserWarning)
 
@@ -39,6 +51,14 @@ board_data: Dict[str, Any]
 tiles:      Dict[str, Dict[str, Any]]
 teams:      Dict[str, Dict[str, Any]]
 GRAPH:      nx.DiGraph
+MODEL:      BoardModel              # compiled tiles (geometry, names, arrow successors)
+MOVES:      MoveIndex
+MEMBERS:    Dict[str, str]          # member ID → team name
+PENDING_FORKS: Dict[int, str] = {}  # fork prompt message ID → team name
+board_message: discord.Message | None = None   # pinned board, edited in place
+STORE = StateStore(Path(os.getenv("STATE_DIR", "state")))   # WAL + snapshots
+LOCKS = TeamLocks()                    # one move at a time per team
+OUTBOX = Outbox(lambda cid: bot.get_channel(cid))   # batched, rate-limited sends
 # ---------------------------------------------------------------------------
 
 
@@ -46,127 +66,333 @@ def is_me(msg: discord.Message) -> bool:
     return msg.author == bot.user
 
 
-def tile_index(tid: str) -> int:
-    return int(tid.replace("tile", ""))
+def team_of(user) -> str | None:
+    return GameUtils.find_team_name(user, teams, MEMBERS)
 
 
-def tile_id(idx: int) -> str:
-    return f"tile{idx}"
+def persist(tname: str) -> None:
+    """Write *tname*'s position/counters to the state log."""
+    STORE.record(tname, teams[tname])
+
+
+def notify(text: str, *, batch: bool = True, tail: bool = False, file=None) -> asyncio.Future:
+    """
+    Queue *text* for the notification channel. Consecutive lines may share
+    one message; tail=True keeps anything from being appended after *text*
+    (reaction prompts), batch=False gives it a message of its own.
+    *file* is a zero-arg factory returning a discord.File.
+    """
+    return OUTBOX.post(notification_channel_id, text, batch=batch, tail=tail, file=file)
 
 
 def announce(team: str, verb: str, old_tile: str, dice: int, new_tile: str):
     """Send a status line in the notification channel."""
-    chan = bot.get_channel(notification_channel_id)
+    last = teams[team]["history"].last()
+    stop = " 🛑 must-hit" if last and 0 < last.steps < last.dice else ""
     msg = (
-        f"**{team}** {verb}: **{old_tile}** → **{new_tile}** "
+        f"**{team}** {verb}: **{old_tile}** → **{new_tile}**{stop} "
         f"(🎲 {dice}) • rerolls **{teams[team]['rerolls']}** • "
         f"skips **{teams[team]['skips']}**"
     )
-    asyncio.create_task(chan.send(msg))
+    notify(msg)
+
+
+BOARD_MAX_SIDE = int(os.getenv("BOARD_MAX_SIDE", "4096"))   # px; bigger boards post an overview
+FORK_PREVIEW   = os.getenv("FORK_PREVIEW", "0") == "1"       # attach a board crop to fork prompts
+
+
+async def _find_board_message(chan: discord.TextChannel) -> discord.Message | None:
+    """Our pinned board message, looked up once and then remembered."""
+    global board_message
+    if board_message is None:
+        for m in await chan.pins():
+            if is_me(m) and m.attachments:
+                board_message = m
+                break
+    return board_message
 
 
+@METRICS.timed()
 async def refresh_board():
+    """Render in memory and swap the attachment on the pinned board message."""
+    global board_message
     chan = bot.get_channel(board_channel_id)
-    await chan.purge(check=is_me)
-    generate_board(tiles, board_data, teams)
-    await chan.send(file=discord.File("game_board.png"))
-    print("[DEBUG] Board refreshed")
+    if max(MODEL.width, MODEL.height) > BOARD_MAX_SIDE:   # huge board → overview
+        png = await render_overview_png(MODEL, teams, BOARD_MAX_SIDE)
+    else:
+        png = await render_board_png(MODEL, teams)        # off the loop
+
+    fname = output_filename(MODEL.board, "game_board")
+
+    def _file() -> discord.File:
+        return discord.File(io.BytesIO(png), filename=fname)
+
+    msg = await _find_board_message(chan)
+    if msg is not None:
+        try:
+            with METRICS.timer("discord_upload", op="edit"):
+                await msg.edit(attachments=[_file()])
+            print(f"[DEBUG] Board refreshed {REFRESHER.stats()}")
+            return
+        except discord.NotFound:          # someone deleted/unpinned it
+            board_message = None
+
+    with METRICS.timer("discord_upload", op="post"):
+        board_message = await chan.send(file=_file())
+    try:
+        await board_message.pin()
+    except discord.HTTPException as e:    # missing Manage Messages, pin cap…
+        print(f"[WARN] couldn't pin board message: {e}")
+    print(f"[DEBUG] Board posted {REFRESHER.stats()}")
+
+
+# Moves call REFRESHER.request(); bursts collapse into one render + upload.
+REFRESHER = RefreshScheduler(
+    refresh_board,
+    quiet     = float(os.getenv("BOARD_REFRESH_QUIET", "1.5")),
+    max_delay = float(os.getenv("BOARD_REFRESH_MAX_DELAY", "6")),
+)
+
+# read at scrape time by /perf and the metrics endpoint
+METRICS.register("refresh", REFRESHER.stats)
+METRICS.register("locks",   LOCKS.stats)
+METRICS.register("sprites", ImageProcess.sprite_cache_stats)
+METRICS.register("outbound", OUTBOX.stats)
 
 # ======================= END PART 1/3 =======================
 
 # ========================== main.py (PART 2/3) ==========================
 """Movement logic, skip/reroll, fork chooser, approvals."""
 
-async def choose_path(team: Dict[str, Any], paths: List[List[str]]):
-    """Prompt a team to pick a fork; deduplicate by destination."""
-    # first path for each unique destination
-    uniq: Dict[str, List[str]] = {}
-    for p in paths:
-        uniq.setdefault(p[-1], p)
-
-    channel = bot.get_channel(notification_channel_id)
-    prompt  = await channel.send(f"**{team['name']}**, choose your path:")
+def drop_fork(team: Dict[str, Any]) -> None:
+    """Forget *team*'s open fork prompt, if any."""
+    PENDING_FORKS.pop(team.pop("pending_message", None), None)
+    team.pop("pending_paths", None)
 
-    emoji_map = {}
-    for idx, (dest, _path) in enumerate(uniq.items()):
-        if idx >= len(FORK_EMOJIS):
-            break
-        emoji = FORK_EMOJIS[idx]
-        emoji_map[emoji] = dest
-        await prompt.add_reaction(emoji)
-        await channel.send(f"{emoji} → {tiles[dest]['item-name']}")
 
-    team["pending_paths"] = emoji_map
+def recheck_fork(tname: str) -> str | None:
+    """
+    Re-check *tname*'s open fork after the board changed. If every offered
+    tile is still reachable the prompt stands; otherwise the roll is
+    resolved again from the fork's origin: nothing left voids it, one
+    destination moves the team there, several leave a fresh prompt owed
+    (see ``offer_fork``). Returns a line for the players, or None.
+    """
+    t = teams[tname]
+    pending = t.get("pending_paths")
+    if not pending:
+        return None
+    move = t["history"].last() if isinstance(t.get("history"), MoveHistory) else None
+    if move is not None:
+        paths = MOVES.paths(move.origin, move.dice)
+    else:                                       # prompt from before history: keep what's left
+        paths = {d: [t["tile"], d] for d in pending.values() if d in tiles}
+    if all(d in tiles and d in paths for d in pending.values()):
+        return None
+
+    drop_fork(t)
+    if not paths:
+        return f"**{tname}**, the board changed under your fork and no path is left – that roll is void."
+    if len(paths) == 1:
+        dest, path = next(iter(paths.items()))
+        if move is not None:
+            if len(path) - 1 < move.dice:
+                METRICS.inc("must_hit_stops")
+            t["history"].resolve(path, fork=False)
+        t["tile"] = dest
+        return f"**{tname}**, the board changed under your fork – only **{MODEL.name(dest)}** is left, moved there."
+    t["pending_paths"] = dict(zip(FORK_EMOJIS, paths))     # re-offered by offer_fork
+    return f"**{tname}**, the board changed under your fork – pick again below."
+
+
+async def _fork_preview(cur: str, dests: List[str]) -> bytes:
+    """Board crop around *cur* just big enough to show every option."""
+    c = MODEL.tile(cur)
+    radius = max(max(abs(MODEL.tile(d).row - c.row), abs(MODEL.tile(d).col - c.col))
+                 for d in dests)
+    return await render_viewport_png(MODEL, teams, cur, min(max(radius, 1), 4))
+
+
+async def offer_fork(tname: str) -> None:
+    """
+    Send *tname*'s owed fork prompt: ``pending_paths`` is set (under the
+    team lock, by ``advance_team``) but no ``pending_message`` yet.
+    Runs outside the lock, so a slow notification channel only delays the
+    prompt, not the team's next roll.
+    """
+    t = teams.get(tname)
+    options = t.get("pending_paths") if t else None
+    if not options or t.get("pending_message"):
+        return
+    text = "\n".join([f"**{tname}**, choose your path:"]
+                     + [f"{e} → {MODEL.name(d)}" for e, d in options.items()])
 
+    try:
+        file = None
+        if FORK_PREVIEW:
+            png  = await _fork_preview(t["tile"], list(options.values()))
+            name = output_filename(MODEL.board, "fork")
+            file = lambda: discord.File(io.BytesIO(png), filename=name)
+        prompt = await notify(text, tail=True, file=file)
+    except BaseException:                          # failed or cancelled: no phantom fork move
+        async with LOCKS.hold(tname):
+            if t.get("pending_paths") is options and not t.get("pending_message"):
+                take_back(tname, counted=False)
+                notify(f"**{tname}**, your fork prompt couldn't be posted – that roll "
+                       f"was taken back, please roll again.")
+                REFRESHER.request()
+        raise
 
-async def advance_team(team: Dict[str, Any], dice: int):
+    # track before reacting, so an early click already counts
+    async with LOCKS.hold(tname):
+        if teams.get(tname) is not t or t.get("pending_paths") is not options \
+                or t.get("pending_message"):
+            return                                # a newer roll voided this prompt
+        t["pending_message"] = prompt.id
+        PENDING_FORKS[prompt.id] = tname
+        persist(tname)
+
+    # all reactions at once (Discord may show them out of order; the text is the key)
+    with METRICS.timer("discord_react"):
+        results = await asyncio.gather(*(prompt.add_reaction(e) for e in options),
+                                       return_exceptions=True)
+    for e in results:
+        if isinstance(e, Exception):
+            print(f"[WARN] couldn't add fork reaction for {tname}: {e!r}")
+
+
+async def offer_owed_forks() -> None:
+    """Send every owed fork prompt (after a restart or a /syncsheet)."""
+    owed = [n for n, t in teams.items() if t.get("pending_paths") and not t.get("pending_message")]
+    for n, r in zip(owed, await asyncio.gather(*(offer_fork(n) for n in owed),
+                                               return_exceptions=True)):
+        if isinstance(r, Exception):
+            print(f"[WARN] couldn't send fork prompt for {n}: {r!r}")
+
+
+def offers_fork(fn):
+    """Decorator: after ``fn(tname, ...)`` (and its team lock) returns, send any owed prompt."""
+    @functools.wraps(fn)
+    async def _wrapped(tname: str, *args, **kwargs):
+        result = await fn(tname, *args, **kwargs)
+        await offer_fork(tname)
+        return result
+    return _wrapped
+
+
+@METRICS.timed()
+async def advance_team(team: Dict[str, Any], dice: int, action: str, *,
+                       before: str | None = None):
+    """Move *team* by *dice* and log it; *before* is where it stood if not ``tile``."""
+    drop_fork(team)                         # a new roll voids an unanswered prompt
     cur = team["tile"]
-    paths: List[List[str]] = []
-    for node in GRAPH.nodes:
-        try:
-            for p in nx.all_simple_paths(GRAPH, cur, node, cutoff=dice):
-                if len(p) - 1 == dice:
-                    paths.append(p)
-        except nx.NetworkXNoPath:
-            continue
+    before = before or cur
+    paths = MOVES.paths(cur, dice)          # {destination: path}
 
     if not paths:
+        METRICS.inc("moves", outcome="stuck")
         print(f"[MOVE] No path from {cur} with roll {dice}")
+        team["history"].record(before, [cur], dice, action)
         return
     if len(paths) == 1:
-        team["tile"] = paths[0][-1]
+        METRICS.inc("moves", outcome="single")
+        team["tile"], path = next(iter(paths.items()))
+        if len(path) - 1 < dice:
+            METRICS.inc("must_hit_stops")
+        team["history"].record(before, path, dice, action)
         return
-    await choose_path(team, paths)
+    METRICS.inc("moves", outcome="fork")
+    team["history"].record(before, [cur], dice, action)    # path filled in on pick
+    team["pending_paths"] = dict(zip(FORK_EMOJIS, paths))  # emoji → destination; sent by offer_fork
 
 
+@offers_fork
+@LOCKS.serialized
 async def perform_reroll(tname: str):
     t = teams[tname]
     if t["rerolls"] <= 0:
-        await bot.get_channel(notification_channel_id).send(
-            f"Team **{tname}** has no rerolls left.")
+        notify(f"Team **{tname}** has no rerolls left.")
         return
-    back_idx = tile_index(t["tile"]) - t.get("last_roll", 0)
-    t["tile"] = tile_id(back_idx)
+    before = t["tile"]
+    last = t["history"].last()              # roll again from where that move started
+    if last is not None and last.origin in tiles:
+        t["tile"] = last.origin
 
     dice = GameUtils.roll_dice(3, True)
-    old_name = tiles[tile_id(back_idx)]["item-name"]
-    await advance_team(t, dice)
+    old_name = MODEL.name(t["tile"])
+    await advance_team(t, dice, "reroll", before=before)
     GameUtils.update_last_roll(t, dice)
     t["rerolls"] -= 1
-    announce(tname, "rerolled", old_name, dice, tiles[t["tile"]]["item-name"])
-    await refresh_board()
+    persist(tname)
+    announce(tname, "rerolled", old_name, dice, MODEL.name(t["tile"]))
+    REFRESHER.request()
 
 
+@offers_fork
+@LOCKS.serialized
 async def perform_skip(tname: str):
     t = teams[tname]
     if t.get("skips", 0) <= 0:
-        await bot.get_channel(notification_channel_id).send(
-            f"Team **{tname}** has no skips left.")
+        notify(f"Team **{tname}** has no skips left.")
         return
     dice = GameUtils.roll_dice(3, True)
-    old_name = tiles[t["tile"]]["item-name"]
-    await advance_team(t, dice)
+    old_name = MODEL.name(t["tile"])
+    await advance_team(t, dice, "skip")
     GameUtils.update_last_roll(t, dice)
     t["skips"] -= 1
-    announce(tname, "skipped", old_name, dice, tiles[t["tile"]]["item-name"])
-    await refresh_board()
+    persist(tname)
+    announce(tname, "skipped", old_name, dice, MODEL.name(t["tile"]))
+    REFRESHER.request()
 
 
+@offers_fork
+@LOCKS.serialized
 async def process_drop_approval(tname: str):
     t = teams[tname]
     dice = GameUtils.roll_dice(3, True)
-    old_name = tiles[t["tile"]]["item-name"]
-    await advance_team(t, dice)
+    old_name = MODEL.name(t["tile"])
+    await advance_team(t, dice, "approve")
     GameUtils.update_last_roll(t, dice)
-    announce(tname, "approved", old_name, dice, tiles[t["tile"]]["item-name"])
-    await refresh_board()
+    persist(tname)
+    announce(tname, "approved", old_name, dice, MODEL.name(t["tile"]))
+    REFRESHER.request()
+
+
+def take_back(tname: str, *, counted: bool = True) -> Move | None:
+    """Pop *tname*'s latest move: back to where it started, token refunded."""
+    t = teams[tname]
+    move = t["history"].undo(counted=counted)
+    if move is None:
+        return None
+    drop_fork(t)
+    if move.before in tiles:
+        t["tile"] = move.before
+    if move.action in ("skip", "reroll"):
+        t[move.action + "s"] += 1
+    prev = t["history"].last()
+    GameUtils.update_last_roll(t, prev.dice if prev else 0)
+    persist(tname)
+    return move
+
+
+@LOCKS.serialized
+async def perform_undo(tname: str) -> Move | None:
+    """Take back *tname*'s latest move, refunding the token it used."""
+    t = teams[tname]
+    move = take_back(tname)
+    if move is None:
+        return None
+    notify(f"**{tname}** {move.action} undone: **{MODEL.name(move.dest)}** → "
+           f"**{MODEL.name(t['tile'])}** • rerolls **{t['rerolls']}** • skips **{t['skips']}**")
+    REFRESHER.request()
+    return move
 
 # ======================= END PART 2/3 =======================
 
 # ========================== main.py (PART 3/3) ==========================
 """Discord event-handlers, slash commands, and entry-point.
-   Commands: /grid  /reroll  /skip  /syncsheet
-   /syncsheet is ROLE-gated (see ROLE_ID below).
+   Commands: /grid  /where  /reroll  /skip  /stats  /undo  /syncsheet  /perf
+   /undo, /syncsheet and /perf are ROLE-gated (see ROLE_ID below).
 """
 
 # -----------------------------------------------------------------------
@@ -182,7 +408,14 @@ GUILD_ID = int(os.getenv("DISCORD_GUILD_ID", "0") or 0)
 GUILD    = discord.Object(id=GUILD_ID) if GUILD_ID else None
 
 # -----------------------------------------------------------------------
-# Role-gate helper for /syncsheet
+# Optional Prometheus endpoint (off unless METRICS_PORT is set)
+# -----------------------------------------------------------------------
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0") or 0)
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+metrics_server = None                 # aiohttp runner, started once in on_ready
+
+# -----------------------------------------------------------------------
+# Role-gate helper for /undo, /syncsheet and /perf
 # -----------------------------------------------------------------------
 ROLE_ID = 905218059604725801          # 🔁 replace with your “Bot Admins” role ID
 
@@ -199,8 +432,29 @@ def has_role(role_id: int):
               guild=GUILD)
 async def grid_slash(inter: discord.Interaction):
     await inter.response.defer()
-    path = render_empty_grid(board_data, tiles)
-    await inter.followup.send(file=discord.File(path))
+    png = await asyncio.to_thread(grid_png_bytes, MODEL)   # cached per layout
+    await inter.followup.send(file=discord.File(io.BytesIO(png), filename="grid_preview.png"))
+
+# -----------------------------------------------------------------------
+# Slash command: /where
+# -----------------------------------------------------------------------
+@TREE.command(name="where",
+              description="Show the part of the board around your team",
+              guild=GUILD)
+@appcmd.describe(radius="How many tiles to show around your team (1-8)")
+async def where_slash(inter: discord.Interaction, radius: appcmd.Range[int, 1, 8] = 3):
+    tname = team_of(inter.user)
+    if not tname:
+        await inter.response.send_message(
+            "You aren't on any team. Ask an admin to add you first.",
+            ephemeral=True,
+        )
+        return
+    await inter.response.defer(ephemeral=True)
+    png = await render_viewport_png(MODEL, teams, teams[tname]["tile"], radius)
+    await inter.followup.send(file=discord.File(io.BytesIO(png),
+                                                filename=output_filename(MODEL.board, "where")),
+                              ephemeral=True)
 
 # -----------------------------------------------------------------------
 # Slash command: /reroll
@@ -209,7 +463,7 @@ async def grid_slash(inter: discord.Interaction):
               description="Use one reroll to roll again from your previous spot",
               guild=GUILD)
 async def reroll_slash(inter: discord.Interaction):
-    tname = GameUtils.find_team_name(inter.user, teams)
+    tname = team_of(inter.user)
     if not tname:
         await inter.response.send_message(
             "You aren't on any team. Ask an admin to add you first.",
@@ -226,7 +480,7 @@ async def reroll_slash(inter: discord.Interaction):
               description="Spend one skip token to roll ahead without completing the tile",
               guild=GUILD)
 async def skip_slash(inter: discord.Interaction):
-    tname = GameUtils.find_team_name(inter.user, teams)
+    tname = team_of(inter.user)
     if not tname:
         await inter.response.send_message(
             "You aren't on any team. Ask an admin to add you first.",
@@ -236,6 +490,56 @@ async def skip_slash(inter: discord.Interaction):
     await inter.response.defer()
     await perform_skip(tname)
 
+# -----------------------------------------------------------------------
+# Slash command: /stats
+# -----------------------------------------------------------------------
+def stats_report(tname: str, recent: int = 5) -> str:
+    """Totals plus the last few moves, straight from the team's history."""
+    hist = teams[tname]["history"]
+    s = hist.stats()
+    actions = ", ".join(f"{a} {n}" for a, n in s["actions"].items()) or "none yet"
+    lines = [f"**{tname}** – {s['moves']} moves · {s['steps']} tiles · avg 🎲 {s['avg_roll']} · "
+             f"{s['forks']} forks · {s['undos']} undone ({actions})"]
+    for m in list(hist.moves)[-recent:][::-1]:
+        lines.append(f"🎲 {m.dice} {m.action}: {MODEL.name(m.before)} → {MODEL.name(m.dest)}"
+                     + (" (fork)" if m.fork else ""))
+    return "\n".join(lines)
+
+
+@TREE.command(name="stats",
+              description="Moves, tiles walked and recent rolls for a team",
+              guild=GUILD)
+@appcmd.describe(team="Team name (defaults to your own)")
+async def stats_slash(inter: discord.Interaction, team: str | None = None):
+    tname = team or team_of(inter.user)
+    if tname not in teams:
+        await inter.response.send_message(
+            f"No team **{team}**." if team else "You aren't on any team. Ask an admin to add you first.",
+            ephemeral=True,
+        )
+        return
+    await inter.response.send_message(stats_report(tname), ephemeral=True)
+
+# -----------------------------------------------------------------------
+# Slash command: /undo  (ROLE-gated)
+# -----------------------------------------------------------------------
+@TREE.command(name="undo",
+              description="Admin: take back a team's latest move",
+              guild=GUILD)
+@has_role(ROLE_ID)
+@appcmd.describe(team="Team name")
+async def undo_slash(inter: discord.Interaction, team: str):
+    if team not in teams:
+        await inter.response.send_message(f"No team **{team}**.", ephemeral=True)
+        return
+    await inter.response.defer(ephemeral=True)
+    move = await perform_undo(team)
+    await inter.followup.send(
+        f"Undid **{team}**'s {move.action} (🎲 {move.dice})." if move
+        else f"**{team}** has no moves to undo (only the last {teams[team]['history'].moves.maxlen} are kept).",
+        ephemeral=True,
+    )
+
 # -----------------------------------------------------------------------
 # Slash command: /syncsheet  (ROLE-gated)
 # -----------------------------------------------------------------------
@@ -243,28 +547,129 @@ async def skip_slash(inter: discord.Interaction):
               description="Admin: reload board from Google Sheet CSVs",
               guild=GUILD)
 @has_role(ROLE_ID)          # ✅ only members with this role can run it
-async def syncsheet_slash(inter: discord.Interaction):
+@appcmd.describe(reset="Also move every team back to its startTile and reset tokens")
+async def syncsheet_slash(inter: discord.Interaction, reset: bool = False):
     await inter.response.defer(thinking=True)
     try:
-        from tools.sheet_loader import load_from_sheet
-        global board_data, tiles, teams, GRAPH
+        from tools.sheet_loader import load_from_sheet_async
 
-        board_data, tiles, teams = load_from_sheet()
+        new_board, new_tiles, new_teams = await load_from_sheet_async()
+        diff = apply_sheet(new_board, new_tiles, new_teams, reset=reset)
 
-        # rebuild graph
-        GRAPH.clear()
-        for tid, td in tiles.items():
-            for nxt in td.get("next", []):
-                GRAPH.add_edge(tid, nxt)
-
-        await refresh_board()
+        if diff.tiles_touched or diff.teams_added or diff.teams_removed or reset:
+            await REFRESHER.flush()
         await inter.followup.send(
-            f"Sheet imported – **{len(tiles)} tiles**, **{len(teams)} teams**"
+            f"Sheet imported – **{len(tiles)} tiles**, **{len(teams)} teams** "
+            f"({diff.summary()}{', positions reset' if reset else ''})"
         )
+        await offer_owed_forks()          # forks the new board re-opened
     except Exception as e:
         await inter.followup.send(f"❌ Import failed: `{e}`", ephemeral=True)
         raise
 
+
+def apply_sheet(new_board: Dict[str, Any],
+                new_tiles: Dict[str, Dict[str, Any]],
+                new_teams: Dict[str, Dict[str, Any]],
+                *, reset: bool = False) -> BoardDiff:
+    """
+    Patch the live board/teams in place with only what the sheet changed.
+    Team positions and tokens survive unless *reset* is set (or the team's
+    tile no longer exists, in which case it goes back to its startTile).
+    An open fork whose options the new board no longer has is resolved
+    again (see ``recheck_fork``); callers send any re-offered prompt.
+    """
+    global MODEL
+    output_format(new_board)          # bad image format/level → fail the sync, not every render
+    diff = diff_board(board_data, tiles, teams, new_board, new_tiles, new_teams)
+
+    # ---- board + tiles ----
+    if diff.board_changed:
+        board_data.clear()
+        board_data.update(new_board)
+    for tid in diff.tiles_removed:
+        del tiles[tid]
+    for tid in diff.tiles_added + diff.tiles_changed:
+        tiles[tid] = new_tiles[tid]
+    if diff.edges_added or diff.edges_removed or diff.tiles_added or diff.tiles_changed:
+        # only tiles near changed edges / must-hit flags rewalk
+        MOVES.sync(tile_edges(tiles), must_hit_tiles(tiles))
+    if diff.tiles_touched:
+        MODEL = ETL.compile(board_data, tiles)
+
+    # ---- teams ----
+    for name in diff.teams_removed:
+        drop_fork(teams.pop(name))
+        GameUtils.reindex_team(MEMBERS, name, [])
+    for name in diff.teams_added:
+        teams[name] = new_teams[name]
+        GameUtils.reindex_team(MEMBERS, name, new_teams[name].get("members", []))
+    for name in diff.teams_changed:
+        live = teams[name]
+        keep = {k: live[k] for k in TEAM_STATE_KEYS if k in live and not reset}
+        live.clear()
+        live.update(new_teams[name])
+        live.update(keep)
+    for name in diff.members_changed:
+        GameUtils.reindex_team(MEMBERS, name, teams[name].get("members", []))
+
+    touched = set(diff.teams_added + diff.teams_changed)
+    for name, t in teams.items():
+        if reset:
+            t.update({k: v for k, v in new_teams[name].items() if k in TEAM_STATE_KEYS})
+            t["history"] = MoveHistory()
+            drop_fork(t)
+        elif t["tile"] not in tiles:
+            print(f"[SYNC] {name}: tile {t['tile']} removed → back to start")
+            t["tile"] = new_teams[name]["tile"]
+            drop_fork(t)
+            touched.add(name)
+        elif (line := recheck_fork(name)) is not None:
+            print(f"[SYNC] {name}: fork options changed")
+            notify(line)
+            touched.add(name)
+        t.setdefault("rerolls", 0)
+        t.setdefault("skips",   0)
+        t.setdefault("last_roll", 0)
+        if not isinstance(t.get("history"), MoveHistory):
+            t["history"] = MoveHistory()
+
+    if reset or diff.teams_removed:
+        STORE.replace(teams)
+    else:
+        for name in touched:
+            persist(name)
+    print(f"[SYNC] {diff.summary()}")
+    return diff
+
+# -----------------------------------------------------------------------
+# Slash command: /perf  (ROLE-gated)
+# -----------------------------------------------------------------------
+def perf_report(limit: int = 1900) -> str:
+    """Recent timing percentiles + counters, trimmed to fit one message."""
+    lines = [f"{'series':<30} {'n':>6} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}  ms"]
+    for r in METRICS.percentiles():
+        lines.append(f"{r['name'][:30]:<30} {r['count']:>6} {r['p50']:>8.1f} "
+                     f"{r['p90']:>8.1f} {r['p99']:>8.1f} {r['max']:>8.1f}")
+    lines.append("")
+    lines += [f"{k[:30]:<30} {v:>8g}" for k, v in METRICS.counters().items()]
+
+    out = ""
+    for line in lines:
+        if len(out) + len(line) + 8 > limit:
+            out += "…\n"
+            break
+        out += line + "\n"
+    return f"```\n{out}```"
+
+
+@TREE.command(name="perf",
+              description="Admin: recent timings and counters",
+              guild=GUILD)
+@has_role(ROLE_ID)
+async def perf_slash(inter: discord.Interaction):
+    await inter.response.send_message(perf_report(), ephemeral=True)
+
 # -----------------------------------------------------------------------
 # Events
 # -----------------------------------------------------------------------
@@ -278,27 +683,48 @@ async def on_ready():
     synced = await TREE.sync(guild=GUILD)
     print("[SLASH] synced:", [c.name for c in synced])
 
-    # (optional) any other startup tasks
-    await bot.get_channel(notification_channel_id).purge(check=is_me)
-    await refresh_board()
+    # (optional) any other startup tasks – open fork prompts stay, they're still live
+    with METRICS.timer("discord_purge"):
+        purged = await bot.get_channel(notification_channel_id).purge(
+            check=lambda m: is_me(m) and m.id not in PENDING_FORKS)
+    METRICS.inc("discord_purged", len(purged))
+
+    # prompts owed from before a restart (saved between roll and send, or re-offered)
+    await offer_owed_forks()
+
+    global metrics_server
+    if METRICS_PORT and metrics_server is None:        # on_ready re-fires on reconnect
+        metrics_server = await METRICS.serve(METRICS_PORT, METRICS_HOST)
+    await REFRESHER.flush()
     print(f"[READY] {bot.user} online ✔")
     
 @bot.event
+@METRICS.timed()
 async def on_message(msg: discord.Message):
     if is_me(msg):
         return
 
-    tname   = GameUtils.find_team_name(msg.author, teams)
+    # cheap early-outs: only two channels matter, and only some messages
+    if msg.channel.id == image_channel_id:
+        if not msg.attachments:
+            return
+    elif msg.channel.id == notification_channel_id:
+        if msg.content.strip().lower() not in ("!skip", "!reroll"):
+            return
+    else:
+        return
+
+    tname   = team_of(msg.author)
     content = msg.content.strip().lower()
 
     # image upload channel
     if msg.channel.id == image_channel_id and msg.attachments:
         if tname:
-            await bot.get_channel(notification_channel_id).send(
-                f"**{tname}** uploaded a drop – waiting for approval.")
+            notify(f"**{tname}** uploaded a drop – waiting for approval.")
         for e in (CHECK_EMOJI, CROSS_EMOJI):
             try:
-                await msg.add_reaction(e)
+                with METRICS.timer("discord_react"):
+                    await msg.add_reaction(e)
             except Exception:
                 pass
         return
@@ -312,40 +738,65 @@ async def on_message(msg: discord.Message):
         return
 
 @bot.event
+@METRICS.timed()
 async def on_reaction_add(reaction: discord.Reaction, user: discord.User):
     if user.bot:
         return
 
     # ✅ / ❌ approval on image
     if reaction.message.channel.id == image_channel_id:
-        tname = GameUtils.find_team_name(user, teams)
+        tname = team_of(user)
         if not tname:
             return
         if str(reaction.emoji) == CHECK_EMOJI:
-            await process_drop_approval(tname)
+            key = ("approve", reaction.message.id)
+            if LOCKS.seen(key):
+                return                    # second ✅ on the same drop
+            try:
+                await process_drop_approval(tname)
+            except Exception:
+                LOCKS.forget(key)         # failed → a later ✅ may retry
+                raise
         elif str(reaction.emoji) == CROSS_EMOJI:
-            await bot.get_channel(notification_channel_id).send(
-                f"**{tname}** drop was declined.")
+            notify(f"**{tname}** drop was declined.")
         return
 
-    # fork-choice reactions
-    for t in teams.values():
-        pending = t.get("pending_paths")
-        if pending and str(reaction.emoji) in pending and str(user.id) in t["members"]:
-            t["tile"] = pending.pop(str(reaction.emoji))
-            t.pop("pending_paths", None)
-            await refresh_board()
+    # fork-choice reactions, looked up by prompt message
+    tname = PENDING_FORKS.get(reaction.message.id)
+    emoji = str(reaction.emoji)
+    if tname is None or tname not in teams or team_of(user) != tname:
+        return
+    t = teams[tname]
+    async with LOCKS.hold(tname):
+        pending = t.get("pending_paths")         # may have changed while queued
+        if t.get("pending_message") != reaction.message.id or not pending or emoji not in pending:
             return
+        dest, move = pending[emoji], t["history"].last()
+        if dest not in tiles:                    # removed by /syncsheet meanwhile
+            drop_fork(t)
+            persist(tname)
+            return
+        if move is not None:                     # None only for a prompt from before history
+            path = MOVES.paths(move.origin, move.dice).get(dest) or [move.origin, dest]
+            if len(path) - 1 < move.dice:
+                METRICS.inc("must_hit_stops")
+            t["history"].resolve(path)
+        t["tile"] = dest
+        drop_fork(t)
+        persist(tname)
+    REFRESHER.request()
 
 # -----------------------------------------------------------------------
-# Entry-point
+# Game setup (entry-point and tools/load_test.py)
 # -----------------------------------------------------------------------
-if __name__ == "__main__":
-    board_data, tiles, teams = ETL.load()
-
-    image_channel_id        = int(os.environ["IMAGE_CHANNEL_ID"])
-    notification_channel_id = int(os.environ["NOTIFICATION_CHANNEL_ID"])
-    board_channel_id        = int(os.environ["BOARD_CHANNEL_ID"])
+def load_game(new_board: Dict[str, Any],
+              new_tiles: Dict[str, Dict[str, Any]],
+              new_teams: Dict[str, Dict[str, Any]]) -> None:
+    """Make a validated config the live game, resuming from the state log."""
+    global board_data, tiles, teams, MODEL, MEMBERS, GRAPH, MOVES
+    output_format(new_board)          # bad image format/level → fail at startup
+    board_data, tiles, teams = new_board, new_tiles, new_teams
+    MODEL = ETL.compile(board_data, tiles)
 
     # ensure counters present
     for d in teams.values():
@@ -353,15 +804,46 @@ if __name__ == "__main__":
         d.setdefault("skips",   0)
         d.setdefault("last_roll", 0)
 
-    # build graph once
-    GRAPH = nx.DiGraph()
-    for tid, td in tiles.items():
-        for nxt in td.get("next", []):
-            GRAPH.add_edge(tid, nxt)
+    # build graph + move index once
+    GRAPH = build_graph(tiles)
+    MOVES = MoveIndex(GRAPH, must_hit=must_hit_tiles(tiles))
+
+    # resume the race from the state log (positions, tokens, open forks, history)
+    start = {name: d["tile"] for name, d in teams.items()}
+    STORE.restore(teams)
+    for name, d in teams.items():
+        if not isinstance(d.get("history"), MoveHistory):
+            d["history"] = MoveHistory.from_state(d.get("history"))
+        # the config may have been rewritten since the state was saved
+        if d["tile"] not in tiles:
+            print(f"[STATE] {name}: tile {d['tile']} no longer exists → back to start")
+            d["tile"] = start[name]
+            drop_fork(d)
+            persist(name)
+        elif (line := recheck_fork(name)) is not None:
+            print(f"[STATE] {name}: fork options changed – {line}")
+            persist(name)
+    MEMBERS = GameUtils.build_member_index(teams)
+    PENDING_FORKS.clear()
+    PENDING_FORKS.update({t["pending_message"]: name for name, t in teams.items()
+                          if t.get("pending_message") and t.get("pending_paths")})
+
+# -----------------------------------------------------------------------
+# Entry-point
+# -----------------------------------------------------------------------
+if __name__ == "__main__":
+    load_game(*ETL.load())
+
+    image_channel_id        = int(os.environ["IMAGE_CHANNEL_ID"])
+    notification_channel_id = int(os.environ["NOTIFICATION_CHANNEL_ID"])
+    board_channel_id        = int(os.environ["BOARD_CHANNEL_ID"])
 
     token = os.getenv("DISCORD_TOKEN")
     if not token:
         raise RuntimeError("DISCORD_TOKEN not set")
-    bot.run(token)
+    try:
+        bot.run(token)
+    finally:
+        STORE.close()                 # fsync whatever the last burst left behind
 
 # ======================== END main.py ===================================
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""tools/bench_encode.py – compare board upload encodings.
+
+Renders the board once (from game-config.json, or a synthetic board with
+``--tiles N``), then encodes it with every format/level in the matrix and
+reports median encode time and bytes, smallest first.
+
+Usage:
+  python -m tools.bench_encode
+  python -m tools.bench_encode --tiles 400 --repeat 5 --json encode.json
+"""
+from __future__ import annotations
+
+import argparse, json, pathlib, statistics, sys, time
+from typing import Dict, Any, List, Tuple
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from load_config import ETL                                     # noqa: E402
+from utils.board import encode_image, render_board               # noqa: E402
+from tools.synthetic import make_board                           # noqa: E402
+
+# (format, level) pairs worth comparing
+MATRIX: List[Tuple[str, int]] = [
+    ("png", 1), ("png", 6), ("png", 9),
+    ("png8", 1), ("png8", 6), ("png8", 9),
+    ("webp", 0), ("webp", 4), ("webp", 6),
+    ("jpeg", 75), ("jpeg", 85), ("jpeg", 95),
+]
+
+
+def bench(img, repeat: int) -> List[Dict[str, Any]]:
+    rows = []
+    for fmt, level in MATRIX:
+        times, size = [], 0
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            size = len(encode_image(img, fmt, level))
+            times.append(time.perf_counter() - t0)
+        rows.append({"format": fmt, "level": level,
+                     "ms": round(statistics.median(times) * 1000, 2), "bytes": size})
+    return sorted(rows, key=lambda r: r["bytes"])
+
+
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--config", default=str(ROOT / "game-config.json"))
+    ap.add_argument("--tiles", type=int, help="use a synthetic board of N tiles instead")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--json", help="also write results here")
+    args = ap.parse_args(argv)
+
+    if args.tiles:
+        board_data, tiles, _ = make_board(args.tiles, branching=0, teams=0, tile_size=80,
+                                          player_size=40, negative=False)
+        teams = {}
+    else:
+        board_data, tiles, teams = ETL.load(args.config)
+    model = ETL.compile(ETL.board_settings({"board-config": board_data}), tiles)
+    img   = render_board(model, teams)
+
+    rows = bench(img, args.repeat)
+    raw  = img.width * img.height * 4
+    print(f"🖼   {img.width}×{img.height} RGBA ({raw / 1e6:.1f} MB raw), "
+          f"median of {args.repeat}")
+    print(f"    {'format':<6} {'level':>5} {'ms':>9} {'bytes':>11} {'ratio':>7}")
+    for r in rows:
+        print(f"    {r['format']:<6} {r['level']:>5} {r['ms']:>9.2f} "
+              f"{r['bytes']:>11,} {r['bytes'] / raw:>7.1%}")
+
+    if args.json:
+        pathlib.Path(args.json).write_text(json.dumps(
+            {"size": [img.width, img.height], "repeat": args.repeat, "results": rows},
+            indent=2), encoding="utf-8")
+        print(f"\n💾  Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
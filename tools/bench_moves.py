@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""tools/bench_moves.py – move-resolution benchmark and cross-check.
+
+Builds synthetic boards (tools/synthetic.py) in four shapes
+
+  linear    one path, no forks
+  forked    half the tiles fork 2‥4 tiles ahead
+  cyclic    forks plus back-edges, so walks can loop
+  must-hit  forks plus ~10 % must-hit tiles (walks stop on them)
+
+and, for each, times roll resolution in ``utils.move_index.MoveIndex``
+(table build, lookup, incremental ``sync`` after an edge edit) against
+the original ``advance_team`` sweep of ``nx.all_simple_paths`` over every
+node.
+
+Every run also cross-checks the two: for sampled (tile, roll) pairs the
+destination sets must be identical and every representative path must be
+a real simple path of exactly *roll* steps, or fewer if it ends on a
+must-hit tile, that passes no other must-hit tile. The same check runs
+again after randomly editing edges and must-hit flags and calling ``sync``. Any mismatch is
+printed and the exit status is 1, so move optimisations can be verified
+before they ship.
+
+Usage:
+  python -m tools.bench_moves
+  python -m tools.bench_moves --sizes 200 --shapes cyclic --check-tiles 0
+  python -m tools.bench_moves --sizes 5000 --samples 10 --check-tiles 10
+  python -m tools.bench_moves --json moves.json
+"""
+from __future__ import annotations
+
+import argparse, json, pathlib, random, statistics, sys, time
+from typing import Dict, Any, List, Set
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import networkx as nx                                            # noqa: E402
+
+from tools.synthetic import make_board                           # noqa: E402
+from utils.move_index import (MAX_ROLL, MoveIndex, build_graph,    # noqa: E402
+                              must_hit_tiles, tile_edges)
+
+SIZES  = [100, 1000]      # the reference is O(tiles) per roll; try --sizes 5000 with few samples
+SHAPES: Dict[str, Dict[str, float]] = {
+    "linear":   {"branching": 0.0},
+    "forked":   {"branching": 0.5},
+    "cyclic":   {"branching": 0.2, "cycles": 0.3},
+    "must-hit": {"branching": 0.2, "must_hit": 0.1},
+}
+
+
+# ---------------------------------------------------------------------------
+# Reference – the pre-MoveIndex advance_team sweep, plus must-hit stops
+# ---------------------------------------------------------------------------
+def legal(path: List[str], dice: int, must_hit: Set[str]) -> bool:
+    """A walk of *dice* steps, or a shorter one that ends on a must-hit tile."""
+    steps = len(path) - 1
+    return (not must_hit.intersection(path[1:-1])
+            and (steps == dice or 0 < steps < dice and path[-1] in must_hit))
+
+
+def reference_paths(graph: nx.DiGraph, cur: str, dice: int,
+                    must_hit: Set[str] = frozenset()) -> List[List[str]]:
+    paths: List[List[str]] = []
+    for node in graph.nodes:
+        try:
+            for p in nx.all_simple_paths(graph, cur, node, cutoff=dice):
+                if legal(p, dice, must_hit):
+                    paths.append(p)
+        except nx.NetworkXNoPath:
+            continue
+    return paths
+
+
+def check(index: MoveIndex, graph: nx.DiGraph, tiles: List[str]) -> List[str]:
+    """Compare *index* with the reference for every roll from *tiles*."""
+    problems: List[str] = []
+    for cur in tiles:
+        for dice in range(1, index.max_roll + 1):
+            want: Set[str] = {p[-1] for p in reference_paths(graph, cur, dice, index.must_hit)}
+            got = index.paths(cur, dice)
+            if set(got) != want:
+                problems.append(f"{cur} roll {dice}: index {sorted(got)} ≠ reference {sorted(want)}")
+                continue
+            for dest, path in got.items():
+                if (path[0] != cur or path[-1] != dest or not legal(path, dice, index.must_hit)
+                        or len(set(path)) != len(path)
+                        or not all(graph.has_edge(a, b) for a, b in zip(path, path[1:]))):
+                    problems.append(f"{cur} roll {dice}: bad path to {dest}: {path}")
+    return problems
+
+
+def _mutate(tiles: Dict[str, Dict[str, Any]], rng: random.Random, edits: int) -> None:
+    """Add or drop *edits* random `next` links (or flip must-hit flags) in place."""
+    ids = list(tiles)
+    flags = any(t.get("must-hit") for t in tiles.values())
+    for _ in range(edits):
+        t = tiles[rng.choice(ids)]
+        if flags and rng.random() < 0.25:
+            t["must-hit"] = not t.get("must-hit")
+        elif t["next"] and rng.random() < 0.5:
+            t["next"].pop(rng.randrange(len(t["next"])))
+        else:
+            nxt = rng.choice(ids)
+            if nxt not in t["next"]:
+                t["next"].append(nxt)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 4)
+
+
+# ---------------------------------------------------------------------------
+# One case
+# ---------------------------------------------------------------------------
+def run_case(shape: str, n: int, samples: int, check_tiles: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    _, tiles, _ = make_board(n, teams=0, seed=seed, **SHAPES[shape])
+    graph = build_graph(tiles)
+    edges = graph.number_of_edges()
+
+    t0 = time.perf_counter()
+    index = MoveIndex(graph, must_hit=must_hit_tiles(tiles))
+    build = time.perf_counter() - t0
+
+    nodes   = list(graph.nodes)
+    queries = [(rng.choice(nodes), rng.randint(1, MAX_ROLL)) for _ in range(samples)]
+
+    ref_t, idx_t, outcomes = [], [], {"none": 0, "single": 0, "fork": 0}
+    for cur, dice in queries:
+        t0 = time.perf_counter()
+        reference_paths(graph, cur, dice, index.must_hit)
+        ref_t.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        dests = index.paths(cur, dice)
+        idx_t.append(time.perf_counter() - t0)
+        outcomes["none" if not dests else "single" if len(dests) == 1 else "fork"] += 1
+
+    pick = lambda: nodes if not check_tiles or check_tiles >= len(nodes) \
+        else rng.sample(nodes, check_tiles)
+    problems = check(index, graph, pick())
+
+    # edit ~1 % of the links/flags, resync, and check again (plus vs. a full rebuild)
+    _mutate(tiles, rng, max(n // 100, 1))
+    t0 = time.perf_counter()
+    touched = index.sync(tile_edges(tiles), must_hit_tiles(tiles))
+    sync = time.perf_counter() - t0
+    nodes = list(graph.nodes)
+    fresh = MoveIndex(graph.copy(), must_hit=must_hit_tiles(tiles))
+    for cur in nodes:
+        for dice in range(1, MAX_ROLL + 1):
+            if set(index.paths(cur, dice)) != set(fresh.paths(cur, dice)):
+                problems.append(f"after sync: {cur} roll {dice} differs from a full rebuild")
+    problems += [f"after sync: {p}" for p in check(index, graph, pick())]
+
+    ref_med, idx_med = statistics.median(ref_t), statistics.median(idx_t)
+    return {
+        "shape":       shape,
+        "tiles":       n,
+        "edges":       edges,
+        "must_hit":    sum(bool(t.get("must-hit")) for t in tiles.values()),
+        "outcomes":    outcomes,
+        "build_ms":    _ms(build),
+        "sync_ms":     _ms(sync),
+        "sync_tiles":  len(touched),
+        "reference_ms": _ms(ref_med),
+        "index_ms":    _ms(idx_med),
+        "speedup":     round(ref_med / idx_med, 1) if idx_med else None,
+        "checked":     len(nodes) if not check_tiles else min(check_tiles, len(nodes)),
+        "problems":    problems,
+    }
+
+
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    ap.add_argument("--shapes", nargs="+", choices=list(SHAPES), default=list(SHAPES))
+    ap.add_argument("--samples", type=int, default=50, help="timed (tile, roll) lookups per case")
+    ap.add_argument("--check-tiles", type=int, default=50,
+                    help="tiles cross-checked against the reference per case (0 = all)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", help="also write results here")
+    args = ap.parse_args(argv)
+
+    rows, failed = [], 0
+    print(f"    {'shape':<9} {'tiles':>6} {'edges':>6} {'build ms':>9} {'sync ms':>8} "
+          f"{'ref ms':>9} {'index ms':>9} {'speedup':>8}  check")
+    for shape in args.shapes:
+        for n in args.sizes:
+            r = run_case(shape, n, args.samples, args.check_tiles, args.seed)
+            rows.append(r)
+            ok = "✅" if not r["problems"] else f"❌ {len(r['problems'])}"
+            print(f"    {shape:<9} {n:>6} {r['edges']:>6} {r['build_ms']:>9.1f} {r['sync_ms']:>8.1f} "
+                  f"{r['reference_ms']:>9.3f} {r['index_ms']:>9.4f} {r['speedup'] or 0:>7.0f}×  {ok}")
+            for p in r["problems"][:10]:
+                print(f"        {p}")
+            failed += bool(r["problems"])
+
+    if args.json:
+        pathlib.Path(args.json).write_text(json.dumps(
+            {"seed": args.seed, "samples": args.samples, "results": rows}, indent=2),
+            encoding="utf-8")
+        print(f"\n💾  Wrote {args.json}")
+
+    if failed:
+        print(f"\n❌  {failed} case(s) disagree with the all_simple_paths reference")
+        sys.exit(1)
+    print("\n✅  MoveIndex matches the all_simple_paths reference")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""tools/bench_render.py – board rendering benchmark.
+
+Builds synthetic boards (tools/synthetic.py: serpentine layout around the
+origin, so negative coords, random forks, N teams) and times each stage of
+a refresh separately:
+
+  background · tiles · captions · arrows   (the cached static layer)
+  copy · tokens · encode                   (paid on every refresh)
+
+plus the /grid, /where viewport and overview paths. Every size runs in a
+fresh process, once cold (empty sprite/font/caption caches) and then
+``--repeat`` times warm (median). Peak memory is reported two ways:
+ru_maxrss of that process (includes Pillow's image buffers) and the
+tracemalloc peak of one extra cold pass (Python-heap allocations only).
+
+Results can be saved with ``--json`` and checked against an earlier run
+with ``--compare``; the exit status is 1 if any warm stage got slower
+than ``--tolerance``.
+
+Usage:
+  python -m tools.bench_render
+  python -m tools.bench_render --sizes 50 500 --teams 8 --json render.json
+  python -m tools.bench_render --compare render.json
+"""
+from __future__ import annotations
+
+import argparse, json, multiprocessing, os, pathlib, platform, statistics
+import subprocess, sys, time, tracemalloc
+from typing import Dict, Any, List
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+try:
+    import resource
+except ImportError:                       # Windows
+    resource = None
+
+SIZES  = [50, 500, 5000]
+STAGES = ["background", "tiles", "captions", "arrows", "copy", "tokens", "encode"]
+EXTRAS = ["grid", "viewport", "overview"]
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+def _cold() -> None:
+    """Empty every render cache so the next pass pays full price."""
+    from utils import board, grid_preview, image_processor
+    board._STATIC_CACHE.clear()
+    board._CHUNK_CACHE.clear()
+    board._OVERVIEW_CACHE.clear()
+    board._CHUNK_INDEX.clear()
+    grid_preview._GRID_CACHE.clear()
+    image_processor._SPRITES.clear()
+    image_processor._font.cache_clear()
+    image_processor._caption_layout.cache_clear()
+
+
+def _pass(model, teams, fmt: str) -> Dict[str, float]:
+    """One full render; seconds per stage."""
+    from utils.board import (_draw_tokens, _render_static, encode_image,
+                             output_format, render_overview, render_viewport)
+    from utils.grid_preview import grid_png_bytes
+
+    out: Dict[str, float] = {}
+    static = _render_static(model, out)
+
+    t0 = time.perf_counter()
+    canvas = static.copy()
+    t1 = time.perf_counter()
+    _draw_tokens(canvas, model, teams)
+    t2 = time.perf_counter()
+    out["bytes"] = len(encode_image(canvas, *output_format(model.board, fmt)))
+    t3 = time.perf_counter()
+    out.update(copy=t1 - t0, tokens=t2 - t1, encode=t3 - t2)
+
+    t0 = time.perf_counter()
+    grid_png_bytes(model)
+    t1 = time.perf_counter()
+    render_viewport(model, teams, next(iter(teams.values()))["tile"], 3)
+    t2 = time.perf_counter()
+    render_overview(model, teams, 1024)
+    t3 = time.perf_counter()
+    out.update(grid=t1 - t0, viewport=t2 - t1, overview=t3 - t2)
+    return out
+
+
+def run_case(n: int, teams: int, branching: float, repeat: int,
+             fmt: str, seed: int) -> Dict[str, Any]:
+    """Benchmark one board size (call in a fresh process for clean RSS)."""
+    import contextlib, io
+    from load_config import ETL
+    from tools.synthetic import make_board
+    from utils import board, grid_preview
+
+    os.chdir(ROOT)                                # sprites load from images/
+    board_data, tiles, team_map = make_board(n, branching=branching,
+                                             teams=teams, seed=seed)
+    model = ETL.compile(ETL.board_settings({"board-config": board_data}), tiles)
+
+    with contextlib.redirect_stdout(io.StringIO()):   # grid prints a line per render
+        _cold()
+        cold = _pass(model, team_map, fmt)
+        warm_runs = []
+        for _ in range(repeat):
+            board._CHUNK_CACHE.clear()            # keep sprites/fonts, drop whole images
+            board._OVERVIEW_CACHE.clear()
+            grid_preview._GRID_CACHE.clear()
+            warm_runs.append(_pass(model, team_map, fmt))
+        rss = _peak_rss_mb()
+
+        _cold()
+        tracemalloc.start()
+        _pass(model, team_map, fmt)
+        _, py_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    ms = lambda s: round(s * 1000, 2)
+    keys = STAGES + EXTRAS
+    return {
+        "tiles":      n,
+        "teams":      teams,
+        "forks":      sum(len(t["next"]) > 1 for t in tiles.values()),
+        "size":       [model.width, model.height],
+        "bytes":      int(cold["bytes"]),
+        "cold_ms":    {k: ms(cold[k]) for k in keys},
+        "warm_ms":    {k: ms(statistics.median(r[k] for r in warm_runs)) for k in keys},
+        "peak_rss_mb":          rss,
+        "tracemalloc_peak_mb":  round(py_peak / (1 << 20), 1),
+    }
+
+
+def _isolated(case: tuple) -> Dict[str, Any]:
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        return pool.apply(run_case, case)
+
+
+def _git_rev() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print(row: Dict[str, Any]) -> None:
+    w, h = row["size"]
+    print(f"\n🧩  {row['tiles']:,} tiles · {row['forks']} forks · {row['teams']} teams · "
+          f"{w}×{h}px · {row['bytes']:,} bytes")
+    print(f"    {'stage':<11} {'cold ms':>10} {'warm ms':>10}")
+    for k in STAGES + EXTRAS:
+        print(f"    {k:<11} {row['cold_ms'][k]:>10.2f} {row['warm_ms'][k]:>10.2f}")
+    print(f"    peak RSS {row['peak_rss_mb']} MB · tracemalloc peak {row['tracemalloc_peak_mb']} MB")
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], tolerance: float,
+            floor_ms: float = 1.0) -> List[str]:
+    """Warm stages slower than *tolerance* (ignoring sub-*floor_ms* noise)."""
+    before = {r["tiles"]: r for r in old.get("results", [])}
+    worse: List[str] = []
+    for row in new["results"]:
+        base = before.get(row["tiles"])
+        if base is None:
+            continue
+        print(f"\n📊  {row['tiles']:,} tiles vs {old.get('git') or 'baseline'}")
+        for k in STAGES + EXTRAS:
+            a, b = base["warm_ms"].get(k), row["warm_ms"][k]
+            if a is None:
+                continue
+            delta = (b - a) / a if a else 0.0
+            flag = ""
+            if delta > tolerance and b - a > floor_ms:
+                flag = "  ⚠️"
+                worse.append(f"{row['tiles']} tiles / {k}: {a:.2f} → {b:.2f} ms")
+            print(f"    {k:<11} {a:>10.2f} → {b:>10.2f} ms  {delta:+7.1%}{flag}")
+    return worse
+
+
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    ap.add_argument("--teams", type=int, default=8)
+    ap.add_argument("--branching", type=float, default=0.15,
+                    help="probability a tile also links 2‥4 tiles ahead")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--format", default="png", help="encode format (see utils/board.IMAGE_FORMATS)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--in-process", action="store_true",
+                    help="don't spawn a process per size (RSS then accumulates)")
+    ap.add_argument("--json", help="write results here")
+    ap.add_argument("--compare", help="earlier --json output to diff against")
+    ap.add_argument("--tolerance", type=float, default=0.15,
+                    help="allowed warm slow-down before --compare fails (0.15 = 15%%)")
+    args = ap.parse_args(argv)
+    out  = pathlib.Path(args.json).resolve() if args.json else None
+    base = pathlib.Path(args.compare).resolve() if args.compare else None
+
+    run = run_case if args.in_process else (lambda *case: _isolated(case))
+    results = []
+    for n in args.sizes:
+        row = run(n, args.teams, args.branching, args.repeat, args.format, args.seed)
+        _print(row)
+        results.append(row)
+
+    doc = {
+        "git":      _git_rev(),
+        "python":   platform.python_version(),
+        "platform": platform.platform(),
+        "format":   args.format,
+        "repeat":   args.repeat,
+        "seed":     args.seed,
+        "results":  results,
+    }
+    if out:
+        out.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+        print(f"\n💾  Wrote {out}")
+
+    if base:
+        old = json.loads(base.read_text(encoding="utf-8"))
+        worse = compare(old, doc, args.tolerance)
+        if worse:
+            print(f"\n❌  {len(worse)} stage(s) regressed more than {args.tolerance:.0%}:")
+            for w in worse:
+                print(f"    {w}")
+            sys.exit(1)
+        print("\n✅  No warm stage regressed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""tools/fake_discord.py – headless stand-in for the Discord API
+
+Just enough of discord.py's surface for main.py's real handlers to run
+without a gateway connection:
+
+  FakeChannel      send / pins / purge, every message kept in ``.messages``
+  FakeMessage      add_reaction / edit / pin
+  FakeUser         id, roles, bot flag (== by id, like discord.User)
+  FakeReaction     message + emoji, as on_reaction_add receives it
+  FakeInteraction  response.defer / send_message, followup.send
+
+``FakeGuild.install(main)`` points ``main.bot`` at the fake channels and
+user; ``guild.slash(name, user, **options)`` runs a slash command's checks
+and callback the way the app-command tree would. Every REST-like call
+sleeps for ``latency`` seconds (± ``jitter``) so concurrency behaves like
+a real round trip, and is counted in ``guild.calls``.
+"""
+from __future__ import annotations
+
+import asyncio, itertools, random
+from collections import Counter
+from typing import Any, Dict, List
+
+_ids = itertools.count(1_000_000)
+
+
+class FakeRole:
+    def __init__(self, role_id: int):
+        self.id = role_id
+
+
+class FakeUser:
+    def __init__(self, user_id: int, name: str, *, roles: List[int] = (), bot: bool = False):
+        self.id    = user_id
+        self.name  = name
+        self.roles = [FakeRole(r) for r in roles]
+        self.bot   = bot
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    def __eq__(self, other: object) -> bool:
+        return getattr(other, "id", None) == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class FakeMessage:
+    def __init__(self, guild: "FakeGuild", channel: "FakeChannel", author: FakeUser,
+                 content: str = "", attachments: List[Any] = (), files: List[Any] = ()):
+        self.id          = next(_ids)
+        self.guild       = guild
+        self.channel     = channel
+        self.author      = author
+        self.content     = content or ""
+        self.attachments = list(attachments) or list(files)
+        self.reactions: List[str] = []
+        self.pinned = False
+
+    async def add_reaction(self, emoji: str) -> None:
+        await self.guild._call("add_reaction")
+        self.reactions.append(str(emoji))
+
+    async def edit(self, *, content: str | None = None, attachments: List[Any] | None = None,
+                   **_kw: Any) -> "FakeMessage":
+        await self.guild._call("edit", attachments)
+        if content is not None:
+            self.content = content
+        if attachments is not None:
+            self.attachments = list(attachments)
+        return self
+
+    async def pin(self) -> None:
+        await self.guild._call("pin")
+        self.pinned = True
+
+
+class FakeChannel:
+    def __init__(self, guild: "FakeGuild", channel_id: int, name: str):
+        self.guild    = guild
+        self.id       = channel_id
+        self.name     = name
+        self.messages: List[FakeMessage] = []
+
+    async def send(self, content: str | None = None, *, file: Any = None,
+                   files: List[Any] | None = None, **_kw: Any) -> FakeMessage:
+        files = [file] if file is not None else list(files or [])
+        await self.guild._call("send", files)
+        msg = FakeMessage(self.guild, self, self.guild.me, content or "", files=files)
+        self.messages.append(msg)
+        return msg
+
+    async def pins(self) -> List[FakeMessage]:
+        await self.guild._call("pins")
+        return [m for m in self.messages if m.pinned]
+
+    async def purge(self, *, check=lambda m: True, **_kw: Any) -> List[FakeMessage]:
+        await self.guild._call("purge")
+        gone = [m for m in self.messages if check(m)]
+        self.messages = [m for m in self.messages if not check(m)]
+        return gone
+
+    def post(self, author: FakeUser, content: str = "", attachments: int = 0) -> FakeMessage:
+        """A message from a *user* (no API call – it arrives via the gateway)."""
+        msg = FakeMessage(self.guild, self, author, content,
+                          attachments=[f"drop{i}.png" for i in range(attachments)])
+        self.messages.append(msg)
+        return msg
+
+
+class FakeReaction:
+    def __init__(self, message: FakeMessage, emoji: str):
+        self.message = message
+        self.emoji   = emoji
+
+
+class _Response:
+    def __init__(self, inter: "FakeInteraction"):
+        self._inter = inter
+        self._done  = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def defer(self, **_kw: Any) -> None:
+        await self._inter.guild._call("defer")
+        self._done = True
+
+    async def send_message(self, content: str | None = None, **_kw: Any) -> None:
+        await self._inter.guild._call("respond")
+        self._done = True
+        self._inter.replies.append(content or "")
+
+
+class _Followup:
+    def __init__(self, inter: "FakeInteraction"):
+        self._inter = inter
+
+    async def send(self, content: str | None = None, *, file: Any = None, **_kw: Any) -> None:
+        await self._inter.guild._call("followup", [file] if file is not None else [])
+        self._inter.replies.append(content or "")
+
+
+class FakeInteraction:
+    def __init__(self, guild: "FakeGuild", user: FakeUser, channel: FakeChannel):
+        self.guild    = guild
+        self.user     = user
+        self.channel  = channel
+        self.response = _Response(self)
+        self.followup = _Followup(self)
+        self.replies: List[str] = []
+
+
+class FakeGuild:
+    """Channels, users and the latency model shared by every fake object."""
+
+    def __init__(self, *, latency: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        self.latency  = latency
+        self.jitter   = jitter
+        self.rng      = random.Random(seed)
+        self.me       = FakeUser(1, "tile-race-bot", bot=True)
+        self.channels: Dict[int, FakeChannel] = {}
+        self.calls: Counter = Counter()
+        self.upload_bytes = 0
+
+    async def _call(self, kind: str, files: List[Any] | None = None) -> None:
+        self.calls[kind] += 1
+        for f in files or ():
+            fp = getattr(f, "fp", None)
+            if fp is not None and hasattr(fp, "getbuffer"):
+                self.upload_bytes += fp.getbuffer().nbytes
+        if self.latency or self.jitter:
+            await asyncio.sleep(max(self.latency + self.rng.uniform(-self.jitter, self.jitter), 0))
+
+    def channel(self, channel_id: int, name: str) -> FakeChannel:
+        chan = self.channels[channel_id] = FakeChannel(self, channel_id, name)
+        return chan
+
+    # ------------------------------------------------------------------- #
+    # Wiring into main.py
+    # ------------------------------------------------------------------- #
+    def install(self, main: Any) -> None:
+        """Point *main*'s bot at this guild (channels must already exist)."""
+        main.bot.get_channel = self.channels.get
+        main.bot._connection.user = self.me
+
+    async def slash(self, main: Any, name: str, user: FakeUser, channel: FakeChannel,
+                    **options: Any) -> FakeInteraction:
+        """Run /name's checks then its callback, as the command tree would."""
+        cmd = main.TREE.get_command(name, guild=main.GUILD)
+        if cmd is None:
+            raise KeyError(f"no slash command /{name}")
+        inter = FakeInteraction(self, user, channel)
+        for predicate in cmd.checks:
+            if not await predicate(inter):
+                inter.replies.append("check failed")
+                return inter
+        await cmd.callback(inter, **options)
+        return inter
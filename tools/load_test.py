@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""tools/load_test.py – drive main.py's real handlers against a fake guild.
+
+Boots the game through ``main.load_game`` (a synthetic board by default,
+or ``--config``), wires ``main.bot`` to tools/fake_discord.py and lets
+every team act concurrently:
+
+  drop       image upload → on_message, then ✅ → on_reaction_add (roll)
+  fork       when the roll lands on a fork, react with one of the options
+  decline    image upload, then ❌
+  reroll     /reroll         skip     /skip        text   "!skip" message
+  grid       /grid           where    /where       chatter ignored message
+  syncsheet  /syncsheet by an admin, against a local CSV server that
+             sometimes renames a tile (exercises 304s and live diffs)
+
+Each action is timed end-to-end (the handler call, including fake API
+round trips of ``--latency`` ms), then the board refresh queue is drained.
+Prints per-action latency percentiles, overall throughput, fake API call
+counts and the bot's own metrics (refresh, render stages, sends).
+
+State goes to a temporary STATE_DIR, so the real state/ is untouched.
+
+Usage:
+  python -m tools.load_test
+  python -m tools.load_test --teams 16 --events 5000 --tiles 500 --latency 80
+  python -m tools.load_test --config game-config.json --json load.json
+"""
+from __future__ import annotations
+
+import argparse, asyncio, contextlib, csv, hashlib, io, json, os, pathlib, random
+import sys, tempfile, time
+from typing import Dict, Any, List, Tuple
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from aiohttp import web                                          # noqa: E402
+
+from tools.fake_discord import FakeGuild, FakeReaction, FakeUser  # noqa: E402
+from utils.metrics import Metrics                                # noqa: E402
+
+IMAGE_CHANNEL, NOTIFY_CHANNEL, BOARD_CHANNEL = 101, 102, 103
+
+# action → relative weight
+MIX: Dict[str, float] = {
+    "drop":      50,
+    "decline":    5,
+    "reroll":    10,
+    "skip":      10,
+    "text":       5,
+    "grid":       3,
+    "where":     10,
+    "chatter":    6,
+    "syncsheet":  1,
+}
+
+
+# ---------------------------------------------------------------------------
+# Local sheet server for /syncsheet
+# ---------------------------------------------------------------------------
+def _csv(rows: List[Dict[str, Any]]) -> str:
+    buf = io.StringIO()
+    w = csv.DictWriter(buf, fieldnames=list(rows[0]))
+    w.writeheader()
+    w.writerows(rows)
+    return buf.getvalue()
+
+
+class SheetServer:
+    """Serves the Board and Teams tabs as CSV, with ETags."""
+
+    def __init__(self, tiles: Dict[str, Dict[str, Any]], teams: Dict[str, Dict[str, Any]]):
+        self.tiles = {tid: dict(t, next=list(t.get("next", []))) for tid, t in tiles.items()}
+        self.teams = {name: dict(t) for name, t in teams.items()}   # the sheet, not live state
+        self.edits = 0
+        self._runner: web.AppRunner | None = None
+
+    def edit(self, rng: random.Random) -> None:
+        """Rename one tile, as an admin fixing a typo would."""
+        tid = rng.choice(list(self.tiles))
+        self.edits += 1
+        self.tiles[tid]["item-name"] = f"{self.tiles[tid]['item-name'].split(' ·')[0]} · v{self.edits}"
+
+    def _tiles_csv(self) -> str:
+        return _csv([{
+            "row": t["coords"][0], "col": t["coords"][1],
+            "item-name": t.get("item-name", ""), "item-picture": t.get("item-picture", ""),
+            "tile-desc": t.get("tile-desc", ""), "nextTiles": ",".join(t.get("next", [])),
+            "points": t.get("points", 1), "must-hit": "TRUE" if t.get("must-hit") else "",
+        } for t in self.tiles.values()])
+
+    def _teams_csv(self) -> str:
+        return _csv([{
+            "team-name": name, "member-ids": ";".join(t.get("members", [])),
+            "startTile": t["tile"], "rerolls": t.get("rerolls", 0),
+            "skips": t.get("skips", 0), "roleId": t.get("roleId", ""),
+        } for name, t in self.teams.items()])
+
+    async def start(self) -> Tuple[str, str]:
+        def handler(render):
+            async def _get(request: web.Request) -> web.Response:
+                body = render()
+                etag = '"' + hashlib.sha1(body.encode()).hexdigest() + '"'
+                if request.headers.get("If-None-Match") == etag:
+                    return web.Response(status=304, headers={"ETag": etag})
+                return web.Response(text=body, content_type="text/csv", headers={"ETag": etag})
+            return _get
+
+        app = web.Application()
+        app.router.add_get("/tiles.csv", handler(self._tiles_csv))
+        app.router.add_get("/teams.csv", handler(self._teams_csv))
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", 0).start()
+        host, port = self._runner.addresses[0][:2]
+        return f"http://{host}:{port}/tiles.csv", f"http://{host}:{port}/teams.csv"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+class LoadTest:
+    def __init__(self, main: Any, guild: FakeGuild, sheet: SheetServer,
+                 admin: FakeUser, rng: random.Random):
+        self.main  = main
+        self.guild = guild
+        self.sheet = sheet
+        self.admin = admin
+        self.rng   = rng
+        self.lat   = Metrics(window=1_000_000)           # keep every sample
+        self.users: Dict[str, FakeUser] = {
+            name: FakeUser(int(t["members"][0]), f"{name}-player")
+            for name, t in main.teams.items() if t.get("members")
+        }
+        self.image  = guild.channels[IMAGE_CHANNEL]
+        self.notify = guild.channels[NOTIFY_CHANNEL]
+
+    async def _react(self, msg, emoji: str, user: FakeUser) -> None:
+        await self.main.on_reaction_add(FakeReaction(msg, emoji), user)
+
+    async def _fork(self, tname: str, user: FakeUser) -> None:
+        pending = self.main.teams[tname].get("pending_paths")
+        mid     = self.main.teams[tname].get("pending_message")
+        if not pending or mid is None:                   # no fork, or its prompt still queued
+            return
+        prompt = next(m for m in reversed(self.notify.messages) if m.id == mid)
+        with self.lat.timer("fork"):
+            await self._react(prompt, self.rng.choice(list(pending)), user)
+
+    async def act(self, kind: str, tname: str) -> None:
+        main, user = self.main, self.users[tname]
+        if kind in ("drop", "decline"):
+            msg = self.image.post(user, attachments=1)
+            with self.lat.timer("upload"):
+                await main.on_message(msg)
+            with self.lat.timer("approve" if kind == "drop" else "decline"):
+                await self._react(msg, main.CHECK_EMOJI if kind == "drop" else main.CROSS_EMOJI, user)
+            await self._fork(tname, user)
+            return
+
+        with self.lat.timer(kind):
+            if kind in ("reroll", "skip", "grid"):
+                await self.guild.slash(main, kind, user, self.notify)
+            elif kind == "where":
+                await self.guild.slash(main, "where", user, self.notify,
+                                       radius=self.rng.randint(1, 8))
+            elif kind == "text":
+                await main.on_message(self.notify.post(user, "!skip"))
+            elif kind == "chatter":
+                await main.on_message(self.notify.post(user, "gz on the drop!"))
+            elif kind == "syncsheet":
+                if self.rng.random() < 0.5:
+                    self.sheet.edit(self.rng)
+                await self.guild.slash(main, "syncsheet", self.admin, self.notify)
+        if kind in ("reroll", "skip", "text"):
+            await self._fork(tname, user)
+
+    async def team(self, tname: str, events: int) -> None:
+        kinds, weights = zip(*MIX.items())
+        for _ in range(events):
+            await self.act(self.rng.choices(kinds, weights)[0], tname)
+
+
+def _config(args) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    from load_config import ETL
+    if args.config:
+        board_data, tiles, teams = ETL.load(args.config)
+    else:
+        from tools.sheet_loader import _board_data
+        from tools.synthetic import make_board
+        _, tiles, teams = make_board(args.tiles, teams=args.teams,
+                                     branching=args.branching, seed=args.seed)
+        board_data = _board_data()          # what /syncsheet will read back
+    for t in teams.values():                 # enough tokens to keep rerolling
+        t["rerolls"] = t["skips"] = args.tokens
+    return board_data, tiles, teams
+
+
+async def run(args) -> Dict[str, Any]:
+    import main
+    from utils import render_pool
+
+    rng = random.Random(args.seed)
+    board_data, tiles, teams = _config(args)
+
+    sheet = SheetServer(tiles, teams)
+    os.environ["SHEET_CSV_URL"], os.environ["SHEET_TEAMS_CSV_URL"] = await sheet.start()
+
+    guild = FakeGuild(latency=args.latency / 1000, jitter=args.latency / 4000, seed=args.seed)
+    guild.channel(IMAGE_CHANNEL, "drops")
+    guild.channel(NOTIFY_CHANNEL, "notifications")
+    guild.channel(BOARD_CHANNEL, "board")
+    guild.install(main)
+    main.image_channel_id        = IMAGE_CHANNEL
+    main.notification_channel_id = NOTIFY_CHANNEL
+    main.board_channel_id        = BOARD_CHANNEL
+    main.load_game(board_data, tiles, teams)
+
+    admin = FakeUser(42, "admin", roles=[main.ROLE_ID])
+    driver = LoadTest(main, guild, sheet, admin, rng)
+    per_team = max(args.events // max(len(driver.users), 1), 1)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(driver.team(n, per_team) for n in driver.users))
+    busy = time.perf_counter() - t0
+    await main.REFRESHER.flush()                    # board catches up
+    await main.OUTBOX.drain()                       # queued status lines go out
+    wall = time.perf_counter() - t0
+
+    main.STORE.close()
+    render_pool.shutdown()
+    await sheet.stop()
+
+    actions = sum(r["count"] for r in driver.lat.percentiles())
+    return {
+        "tiles":      len(main.tiles),
+        "teams":      len(driver.users),
+        "events":     per_team * len(driver.users),
+        "actions":    actions,
+        "latency_ms": args.latency,
+        "busy_s":     round(busy, 3),
+        "wall_s":     round(wall, 3),
+        "throughput": round(actions / busy, 1) if busy else None,
+        "handlers":   driver.lat.percentiles(),
+        "bot":        [r for r in main.METRICS.percentiles()],
+        "counters":   main.METRICS.counters(),
+        "api_calls":  dict(guild.calls),
+        "upload_mb":  round(guild.upload_bytes / 1e6, 2),
+        "sheet_edits": sheet.edits,
+    }
+
+
+def _table(rows: List[Dict[str, Any]]) -> None:
+    print(f"    {'series':<28} {'n':>7} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}  ms")
+    for r in rows:
+        print(f"    {r['name'][:28]:<28} {r['count']:>7} {r['p50']:>9.1f} {r['p90']:>9.1f} "
+              f"{r['p99']:>9.1f} {r['max']:>9.1f}")
+
+
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--config", help="load this game-config.json instead of a synthetic board")
+    ap.add_argument("--tiles", type=int, default=200, help="synthetic board size")
+    ap.add_argument("--teams", type=int, default=8, help="synthetic team count")
+    ap.add_argument("--branching", type=float, default=0.2)
+    ap.add_argument("--events", type=int, default=2000, help="actions in total, split across teams")
+    ap.add_argument("--latency", type=float, default=40, help="fake Discord round trip, ms")
+    ap.add_argument("--tokens", type=int, default=10_000, help="rerolls/skips per team")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", help="also write results here")
+    ap.add_argument("--verbose", action="store_true", help="show the bot's own log lines")
+    args = ap.parse_args(argv)
+
+    out = pathlib.Path(args.json).resolve() if args.json else None
+    state = tempfile.TemporaryDirectory(prefix="tile-race-load-")
+    os.environ["STATE_DIR"] = state.name            # read when main is imported
+    os.chdir(ROOT)                                  # sprites load from images/
+
+    logs = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with logs:
+        res = asyncio.run(run(args))
+    state.cleanup()
+
+    print(f"🏁  {res['actions']:,} actions · {res['teams']} teams · {res['tiles']} tiles · "
+          f"{res['latency_ms']:g} ms fake API latency")
+    print(f"    {res['busy_s']:.2f} s under load ({res['throughput']:,} actions/s), "
+          f"{res['wall_s']:.2f} s until the board caught up")
+    print("\n⏱   Handlers (end to end)")
+    _table(res["handlers"])
+    print("\n🤖  Bot internals (utils/metrics)")
+    _table(res["bot"])
+    print("\n📨  Fake API calls: " + ", ".join(f"{k} {v:,}" for k, v in sorted(res["api_calls"].items()))
+          + f" · {res['upload_mb']} MB uploaded")
+    c = res["counters"]
+    print(f"🔁  refreshes {c.get('refresh_refreshes', 0)} for {c.get('refresh_requested', 0)} requests "
+          f"({c.get('refresh_coalesced', 0)} coalesced) · sheet edits {res['sheet_edits']}")
+    print(f"📬  status lines {c.get('outbound_lines', 0)} in {c.get('outbound_sent', 0)} messages "
+          f"({c.get('outbound_batched', 0)} batched, {c.get('outbound_failures', 0)} failed)")
+
+    if out:
+        out.write_text(json.dumps(res, indent=2), encoding="utf-8")
+        print(f"\n💾  Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,92 +2,142 @@
 # ------------------------------------------------------------
 # Load Tiles + Teams fresh from the Google-Sheet CSV exports.
 # Used by the /syncsheet slash command.
+#
+# load_from_sheet_async() fetches both CSVs concurrently with
+# aiohttp, parses them in memory (no temp files) and sends
+# If-None-Match / If-Modified-Since, so an unchanged sheet is a
+# 304 and reuses the previously parsed result.
 # ------------------------------------------------------------
 from __future__ import annotations
-import csv, json, os, tempfile, urllib.request
+import asyncio, copy, csv, io, json, os, urllib.request
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+import aiohttp
+
+from load_config import ETL
+from utils.metrics import METRICS
+
+MAX_CSV_BYTES = 5 * 1024 * 1024          # refuse absurd downloads
+FETCH_TIMEOUT = 30                       # seconds, per CSV
 
 # ------------------------------------------------------------
-# Helper: download URL → temp file
+# Conditional-fetch cache: url → validators + parsed payload
 # ------------------------------------------------------------
-def _download(url: str) -> Path:
-    tmp = tempfile.NamedTemporaryFile(delete=False)
-    urllib.request.urlretrieve(url, tmp.name)
-    return Path(tmp.name)
+@dataclass
+class _Cached:
+    etag:          str | None
+    last_modified: str | None
+    parsed:        Any
+
+_CACHE: Dict[str, _Cached] = {}
+FETCH_STATS = {"fetched": 0, "not_modified": 0}
+
+def _rows(text: str) -> List[Dict[str, str]]:
+    return list(csv.DictReader(io.StringIO(text, newline="")))
 
-def _bool(x: str | None) -> bool:
-    return str(x).strip().lower() in {"1", "true", "yes"}
+def _board_data() -> Dict[str, Any]:
+    # Defaults + existing board-config from game-config.json (if present)
+    cfg_path = Path("game-config.json")
+    cfg: Dict[str, Any] = {}
+    if cfg_path.is_file():
+        try:
+            cfg = json.loads(cfg_path.read_text("utf-8"))
+        except Exception as e:
+            print(f"[WARN] couldn't read board-config from {cfg_path}: {e}")
+    return ETL.board_settings(cfg)
+
+def _urls(tiles_url: str | None, teams_url: str | None) -> tuple[str, str]:
+    tiles_url = tiles_url or os.getenv("SHEET_CSV_URL")
+    teams_url = teams_url or os.getenv("SHEET_TEAMS_CSV_URL")
+    if not (tiles_url and teams_url):
+        raise RuntimeError("SHEET_CSV_URL or SHEET_TEAMS_CSV_URL env-vars not set")
+    return tiles_url, teams_url
 
 # ------------------------------------------------------------
-# Main loader
+# Async loader (used by /syncsheet)
 # ------------------------------------------------------------
-def load_from_sheet() -> tuple[
+async def _fetch(session: aiohttp.ClientSession, url: str, parse) -> Any:
+    """GET *url* (conditionally) and return parse(rows); 304 → cached result."""
+    cached  = _CACHE.get(url)
+    headers = {}
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached and cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+
+    async with session.get(url, headers=headers) as resp:
+        if resp.status == 304 and cached:
+            FETCH_STATS["not_modified"] += 1
+            METRICS.inc("sheet_fetch", result="not_modified")
+            return copy.deepcopy(cached.parsed)
+        resp.raise_for_status()
+
+        buf = bytearray()
+        async for chunk in resp.content.iter_chunked(64 * 1024):
+            buf += chunk
+            if len(buf) > MAX_CSV_BYTES:
+                raise ValueError(f"{url}: CSV larger than {MAX_CSV_BYTES} bytes")
+        etag, last_mod = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+
+    FETCH_STATS["fetched"] += 1
+    METRICS.inc("sheet_fetch", result="fetched")
+    parsed = parse(_rows(buf.decode("utf-8-sig")))
+    if etag or last_mod:
+        _CACHE[url] = _Cached(etag, last_mod, copy.deepcopy(parsed))
+    return parsed
+
+@METRICS.timed("sheet_load", mode="async")
+async def load_from_sheet_async(tiles_url: str | None = None,
+                                teams_url: str | None = None,
+                                *, session: aiohttp.ClientSession | None = None) -> tuple[
         Dict[str, Any],                       # board_data
         Dict[str, Dict[str, Any]],            # tiles
         Dict[str, Dict[str, Any]],            # teams
 ]:
-    tiles_url  = os.getenv("SHEET_CSV_URL")
-    teams_url  = os.getenv("SHEET_TEAMS_CSV_URL")
-    if not (tiles_url and teams_url):
-        raise RuntimeError("SHEET_CSV_URL or SHEET_TEAMS_CSV_URL env-vars not set")
+    """Non-blocking load_from_sheet(); URLs default to the env-vars."""
+    tiles_url, teams_url = _urls(tiles_url, teams_url)
 
-    # ---------- 1) Tiles ----------
-    with _download(tiles_url).open(newline="", encoding="utf-8") as fh:
-        tile_rows = list(csv.DictReader(fh))
+    own = session is None
+    if own:
+        session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=FETCH_TIMEOUT))
+    try:
+        tiles, teams = await asyncio.gather(
+            _fetch(session, tiles_url, ETL.parse_tiles),
+            _fetch(session, teams_url, ETL.parse_teams),
+        )
+    finally:
+        if own:
+            await session.close()
 
-    tiles: Dict[str, Dict[str, Any]] = {}
-    for idx, row in enumerate(tile_rows):
-        try:
-            r, c = int(row["row"]), int(row["col"])
-        except (KeyError, ValueError):
-            raise ValueError(f"Row {idx+2}: invalid row/col → {row.get('row')} / {row.get('col')}")
-
-        tiles[f"tile{idx}"] = {
-            "item-name":    row["item-name"].strip(),
-            "item-picture": row["item-picture"].strip(),
-            "tile-desc":    row.get("tile-desc", "").strip(),
-            "coords":       [r, c],
-            "next":        [t.strip() for t in row.get("nextTiles", "").split(",") if t.strip()],
-            "points":       int(row.get("points", "1") or 1),
-            "must-hit":     _bool(row.get("must-hit")),
-        }
+    board_data = _board_data()
+    ETL.validate(board_data, tiles, teams)
+    return board_data, tiles, teams
+
+# ------------------------------------------------------------
+# Blocking loader (scripts / offline use)
+# ------------------------------------------------------------
+def _download(url: str) -> str:
+    with urllib.request.urlopen(url, timeout=FETCH_TIMEOUT) as resp:
+        return resp.read(MAX_CSV_BYTES + 1).decode("utf-8-sig")
+
+@METRICS.timed("sheet_load", mode="blocking")
+def load_from_sheet(tiles_url: str | None = None,
+                    teams_url: str | None = None) -> tuple[
+        Dict[str, Any],                       # board_data
+        Dict[str, Dict[str, Any]],            # tiles
+        Dict[str, Dict[str, Any]],            # teams
+]:
+    tiles_url, teams_url = _urls(tiles_url, teams_url)
+
+    # ---------- 1) Tiles ----------
+    tiles = ETL.parse_tiles(_rows(_download(tiles_url)))
 
     # ---------- 2) Teams ----------
-    with _download(teams_url).open(newline="", encoding="utf-8") as fh:
-        team_rows = list(csv.DictReader(fh))
-
-    teams: Dict[str, Dict[str, Any]] = {}
-    for row in team_rows:
-        name = row["team-name"].strip()
-        if not name:
-            continue
-        teams[name] = {
-            "name":     name,
-            "members":  [m.strip() for m in row["member-ids"].split(";") if m.strip()],
-            "tile":     row["startTile"].strip(),
-            "rerolls":  int(row.get("rerolls", "0") or 0),
-            "skips":    int(row.get("skips",   "0") or 0),
-            "roleId":   row.get("roleId", "").strip(),
-            "last_roll": 0,
-        }
+    teams = ETL.parse_teams(_rows(_download(teams_url)))
 
     # ---------- 3) Board-wide config ----------
-    # Defaults:
-    board_data: Dict[str, Any] = {
-        "board-width":  1600,
-        "board-height": 900,
-        "tile-size":    100,
-        "player-size":  60,
-    }
-
-    # Merge in existing values from game-config.json (if present)
-    cfg_path = Path("game-config.json")
-    if cfg_path.is_file():
-        try:
-            existing = json.loads(cfg_path.read_text("utf-8"))
-            board_data.update(existing.get("board-config", {}))
-        except Exception as e:
-            print(f"[WARN] couldn't read board-config from {cfg_path}: {e}")
-
+    board_data = _board_data()
+    ETL.validate(board_data, tiles, teams)
     return board_data, tiles, teams
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""tools/simulate.py – offline Monte Carlo race simulator for board balancing.
+
+Replays millions of races on the tile graph from game-config.json with the
+bot's own rules:
+  • dice  = GameUtils.roll_dice(3, True)  → 1‥3, 5 % chance of a 4
+  • moves = utils.move_index.MoveIndex    → same destinations as advance_team,
+                                            including stops on must-hit tiles
+  • a roll with no exact path leaves the team where it is
+  • a race ends on any tile without outgoing edges
+
+Forks are chosen uniformly at random (``--policy random``) or always the
+first listed option (``--policy first``).
+
+Usage:
+  python -m tools.simulate --races 2000000
+  python -m tools.simulate --config game-config.json --json sim.json
+"""
+from __future__ import annotations
+
+import argparse, json, pathlib, sys, time
+from collections import Counter
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils.move_index import MoveIndex, build_graph, must_hit_tiles, MAX_ROLL   # noqa: E402
+
+BONUS_PCT = 5               # GameUtils.roll_dice: 5 % chance of a 4
+BASE_MAX  = 3               # GameUtils.roll_dice(3, True)
+
+
+# --------------------------------------------------------------------------- #
+# Transition tables
+# --------------------------------------------------------------------------- #
+class Tables:
+    """Dense NumPy view of a MoveIndex for vectorised stepping."""
+
+    def __init__(self, tiles: Dict[str, Dict[str, Any]]):
+        graph = build_graph(tiles)
+        moves = MoveIndex(graph, must_hit=must_hit_tiles(tiles))
+
+        self.ids: List[str] = list(tiles)
+        for n in graph.nodes:                       # next-refs to unknown ids
+            if n not in tiles:
+                self.ids.append(n)
+        idx = {tid: i for i, tid in enumerate(self.ids)}
+        n = len(self.ids)
+
+        # fork edges = (fork tile, successor) for tiles with >1 successor
+        self.fork_edges: List[Tuple[str, str]] = [
+            (u, v) for u in graph.nodes if graph.out_degree(u) > 1
+            for v in graph.successors(u)
+        ]
+        fe_idx = {e: i for i, e in enumerate(self.fork_edges)}
+
+        width = max([len(moves.paths(t, r)) for t in graph.nodes
+                     for r in range(1, MAX_ROLL + 1)] or [1])
+        self.count = np.zeros((n, MAX_ROLL + 1), dtype=np.int32)
+        self.dest  = np.full((n, MAX_ROLL + 1, width), -1, dtype=np.int32)
+        self.forks = np.full((n, MAX_ROLL + 1, width, MAX_ROLL), -1, dtype=np.int32)
+
+        for tid in graph.nodes:
+            i = idx[tid]
+            for r in range(1, MAX_ROLL + 1):
+                opts = moves.paths(tid, r)
+                self.count[i, r] = len(opts)
+                for k, (dst, path) in enumerate(opts.items()):
+                    self.dest[i, r, k] = idx[dst]
+                    crossed = [fe_idx[e] for e in zip(path, path[1:]) if e in fe_idx]
+                    self.forks[i, r, k, :len(crossed)] = crossed
+
+        self.is_end = np.array([graph.out_degree(t) == 0 if t in graph else True
+                                for t in self.ids])
+        self.index = idx
+
+
+# --------------------------------------------------------------------------- #
+# Simulation
+# --------------------------------------------------------------------------- #
+def roll(rng: np.random.Generator, n: int) -> np.ndarray:
+    d = rng.integers(1, BASE_MAX + 1, size=n, dtype=np.int8)
+    d[rng.integers(0, 100, size=n) < BONUS_PCT] = 4
+    return d
+
+
+def simulate(tiles: Dict[str, Dict[str, Any]], start: str, *, races: int,
+             max_rolls: int = 500, batch: int = 250_000, policy: str = "random",
+             seed: int | None = None) -> Dict[str, Any]:
+    tb  = Tables(tiles)
+    rng = np.random.default_rng(seed)
+    n_tiles, n_fe = len(tb.ids), len(tb.fork_edges)
+
+    landings  = np.zeros(n_tiles, dtype=np.int64)
+    roll_hist = np.zeros(max_rolls + 1, dtype=np.int64)       # finished races
+    fork_hist = np.zeros((n_fe, max_rolls + 1), dtype=np.int64)
+    fork_took = np.zeros(n_fe, dtype=np.int64)
+    unfinished = 0
+
+    s = tb.index[start]
+    done_total = 0
+    while done_total < races:
+        b = min(batch, races - done_total)
+        pos   = np.full(b, s, dtype=np.int32)
+        rolls = np.zeros(b, dtype=np.int32)
+        done  = np.full(b, tb.is_end[s])
+        took  = np.zeros((b, n_fe), dtype=bool) if n_fe else None
+
+        for _ in range(max_rolls):
+            live = np.flatnonzero(~done)
+            if live.size == 0:
+                break
+            d = roll(rng, live.size)
+            p = pos[live]
+            c = tb.count[p, d]
+            rolls[live] += 1
+
+            can = c > 0
+            live, p, d, c = live[can], p[can], d[can], c[can]
+            if policy == "first":
+                k = np.zeros(live.size, dtype=np.int32)
+            else:
+                k = (rng.random(live.size) * c).astype(np.int32)
+
+            dst = tb.dest[p, d, k]
+            pos[live] = dst
+            landings += np.bincount(dst, minlength=n_tiles)
+            if took is not None:
+                fe = tb.forks[p, d, k]                     # (m, MAX_ROLL)
+                rows, cols = np.nonzero(fe >= 0)
+                took[live[rows], fe[rows, cols]] = True
+            done[live] = tb.is_end[dst]
+
+        finished = done
+        unfinished += int((~finished).sum())
+        fr = rolls[finished]
+        roll_hist += np.bincount(fr, minlength=max_rolls + 1)[:max_rolls + 1]
+        if took is not None:
+            fork_took += took.sum(axis=0)
+            rows, cols = np.nonzero(took & finished[:, None])
+            np.add.at(fork_hist, (cols, rolls[rows]), 1)
+        done_total += b
+
+    return _report(tb, races, landings, roll_hist, fork_hist, fork_took, unfinished)
+
+
+# --------------------------------------------------------------------------- #
+# Reporting
+# --------------------------------------------------------------------------- #
+def _percentile(hist: np.ndarray, q: float) -> int | None:
+    total = hist.sum()
+    if not total:
+        return None
+    return int(np.searchsorted(np.cumsum(hist), q * total))
+
+
+def _win_rate(mine: np.ndarray, other: np.ndarray) -> float | None:
+    """P(X_mine < X_other) + ½·P(tie) from two roll-count histograms."""
+    n_m, n_o = mine.sum(), other.sum()
+    if not n_m or not n_o:
+        return None
+    below = np.concatenate(([0], np.cumsum(other)[:-1]))       # #other with fewer rolls
+    above = n_o - below - other
+    wins  = (mine * above).sum() + 0.5 * (mine * other).sum()
+    return float(wins / (n_m * n_o))
+
+
+def _report(tb: Tables, races: int, landings: np.ndarray, roll_hist: np.ndarray,
+            fork_hist: np.ndarray, fork_took: np.ndarray, unfinished: int) -> Dict[str, Any]:
+    finished = int(roll_hist.sum())
+    mean = float((roll_hist * np.arange(roll_hist.size)).sum() / finished) if finished else None
+
+    by_fork: Dict[str, List[int]] = {}
+    for e, (u, _) in enumerate(tb.fork_edges):
+        by_fork.setdefault(u, []).append(e)
+
+    forks: Dict[str, List[Dict[str, Any]]] = {}
+    for e, (u, v) in enumerate(tb.fork_edges):
+        h     = fork_hist[e]
+        other = fork_hist[[i for i in by_fork[u] if i != e]].sum(axis=0)
+        forks.setdefault(u, []).append({
+            "branch":     v,
+            "taken":      float(fork_took[e] / races),
+            "mean_rolls": float((h * np.arange(h.size)).sum() / h.sum()) if h.sum() else None,
+            "win_rate":   _win_rate(h, other),
+        })
+
+    return {
+        "races":       races,
+        "finished":    finished,
+        "unfinished":  unfinished,
+        "rolls": {
+            "mean": mean,
+            "p50":  _percentile(roll_hist, 0.50),
+            "p90":  _percentile(roll_hist, 0.90),
+            "p99":  _percentile(roll_hist, 0.99),
+        },
+        "landings_per_race": {tid: float(landings[i] / races)
+                              for i, tid in enumerate(tb.ids)},
+        "forks": forks,
+    }
+
+
+def _print(res: Dict[str, Any], tiles: Dict[str, Dict[str, Any]], secs: float) -> None:
+    r = res["rolls"]
+    print(f"🎲  {res['races']:,} races in {secs:.2f}s  "
+          f"({res['unfinished']:,} hit the roll cap)")
+    if r["mean"] is not None:
+        print(f"    rolls to finish: mean {r['mean']:.2f} • p50 {r['p50']} "
+              f"• p90 {r['p90']} • p99 {r['p99']}")
+
+    print("\n    landings per race (top 15):")
+    top = sorted(res["landings_per_race"].items(), key=lambda kv: -kv[1])[:15]
+    for tid, v in top:
+        name = tiles.get(tid, {}).get("item-name", "?")
+        print(f"      {tid:>8}  {v:6.3f}  {name}")
+
+    if res["forks"]:
+        print("\n    forks:")
+    for fork, branches in res["forks"].items():
+        print(f"      {fork}:")
+        for b in branches:
+            wr = "   n/a" if b["win_rate"] is None else f"{b['win_rate']:6.1%}"
+            mr = "  n/a" if b["mean_rolls"] is None else f"{b['mean_rolls']:5.1f}"
+            print(f"        → {b['branch']:>8}  taken {b['taken']:6.1%}  "
+                  f"mean rolls {mr}  win {wr}")
+
+
+# --------------------------------------------------------------------------- #
+# CLI
+# --------------------------------------------------------------------------- #
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--config", default=str(ROOT / "game-config.json"))
+    ap.add_argument("--races", type=int, default=1_000_000)
+    ap.add_argument("--start", help="start tile (default: most common team startTile)")
+    ap.add_argument("--max-rolls", type=int, default=500)
+    ap.add_argument("--batch", type=int, default=250_000)
+    ap.add_argument("--policy", choices=("random", "first"), default="random")
+    ap.add_argument("--seed", type=int)
+    ap.add_argument("--json", help="also write the full result here")
+    args = ap.parse_args(argv)
+
+    cfg   = json.loads(pathlib.Path(args.config).read_text("utf-8"))
+    tiles = cfg["tiles"]
+    start = args.start or next(iter(
+        Counter(t["tile"] for t in cfg.get("teams", {}).values()).most_common(1)),
+        (next(iter(tiles)),))[0]
+
+    t0  = time.perf_counter()
+    res = simulate(tiles, start, races=args.races, max_rolls=args.max_rolls,
+                   batch=args.batch, policy=args.policy, seed=args.seed)
+    _print(res, tiles, time.perf_counter() - t0)
+
+    if args.json:
+        pathlib.Path(args.json).write_text(json.dumps(res, indent=2), encoding="utf-8")
+        print(f"\n💾  Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""tools/synthetic.py – reproducible synthetic boards for benchmarks.
+
+``make_board(n)`` lays *n* tiles out as a serpentine path centred on the
+origin (so about half the coords are negative), then adds:
+  • forks      – with probability ``branching`` a tile also links 2‥4 ahead
+  • cycles     – with probability ``cycles`` a tile also links 2‥6 back
+  • must-hit   – with probability ``must_hit`` a tile is flagged must-hit
+Artwork is cycled from the repo's own images/ so sprite loading is real.
+Same arguments → same board.
+"""
+from __future__ import annotations
+
+import math, pathlib, random
+from typing import Dict, Any, Tuple
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+
+def make_board(n: int, *, branching: float = 0.1, cycles: float = 0.0,
+               must_hit: float = 0.0, teams: int = 4, tile_size: int = 60,
+               player_size: int = 30, negative: bool = True, seed: int = 0,
+               ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """Return (board_data, tiles, teams) in the same shape ETL.load() does."""
+    rng   = random.Random(seed)
+    pics  = sorted(p.name for p in (ROOT / "images").glob("*.png")) or [""]
+    width = max(int(math.sqrt(n)), 1)
+    r_off = -((n - 1) // width) // 2 if negative else 0
+    c_off = -width // 2 if negative else 0
+
+    tiles: Dict[str, Dict[str, Any]] = {}
+    for i in range(n):
+        r, c = divmod(i, width)
+        c = c if r % 2 == 0 else width - 1 - c          # serpentine
+        nxt = [i + 1] if i + 1 < n else []
+        if nxt and rng.random() < branching:
+            j = i + rng.randint(2, 4)
+            if j < n:
+                nxt.append(j)
+        if nxt and rng.random() < cycles and i >= 2:
+            nxt.append(max(i - rng.randint(2, 6), 0))
+        tiles[f"tile{i}"] = {
+            "item-name":    f"Tile {i}",
+            "item-picture": pics[i % len(pics)],
+            "tile-desc":    "",
+            "coords":       [r + r_off, c + c_off],
+            "next":         [f"tile{j}" for j in nxt],
+            "points":       1,
+            "must-hit":     0 < i < n - 1 and rng.random() < must_hit,
+        }
+
+    team_map = {
+        f"team{k}": {
+            "name":      f"team{k}",
+            "members":   [str(10_000 + k)],
+            "tile":      f"tile{rng.randrange(n)}",
+            "rerolls":   1,
+            "skips":     1,
+            "roleId":    "",
+            "last_roll": 0,
+        }
+        for k in range(teams)
+    }
+    board_data = {"tile-size": tile_size, "player-size": player_size,
+                  "board-width": 1600, "board-height": 900}
+    return board_data, tiles, team_map
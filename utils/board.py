@@ -2,138 +2,528 @@
 
 • Auto‑scales board to the min/max row/col so tiles at (‑1,‑3) work.
 • Draws tiles, arrows, team tokens, captions.
+• Static layer (background, tiles, captions, arrows) is cached per board;
+  each refresh only copies it and draws the team tokens on top.
+• Geometry comes pre-resolved from a compiled ``BoardModel``.
+• Very large boards can be rendered as cached chunks instead: a cropped
+  viewport around one tile, or a downscaled overview, so memory and encode
+  time follow what is shown rather than the full board area.
+• The overview's downscaled static layer is cached per board like the
+  full one; a refresh only draws the token dots on a copy.
+• Every chunk has a content hash (its tiles, captions and arrows). Chunks
+  are cached by that hash, and after /syncsheet the previous static layer
+  and overview are patched by repainting only the chunks whose hash
+  changed, instead of rendering the whole board again.
 """
 from __future__ import annotations
 
+import hashlib, io, json, os, time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, List, Tuple
 from PIL import Image, ImageDraw, ImageOps
 
+from utils.board_model import BoardModel, TILE_GUTTER
 from utils.image_processor import ImageProcess
 
 # ---------------------------------------------------------------------------
 # Tunables
 # ---------------------------------------------------------------------------
-TILE_GUTTER = 10          # px gap around every square
 ARROW_WIDTH = 4
 TOKEN_DIR   = Path("images/team_tokens")  # teama.png etc.
+STATIC_CACHE_SIZE = 2     # boards kept (current + one /syncsheet back)
 
-# ---------------------------------------------------------------------------
-# Helpers that respect negative coords (need min_row/min_col offsets)
-# ---------------------------------------------------------------------------
+# model.key → (layout signature, chunk hashes, layer)
+_STATIC_CACHE: "OrderedDict[str, Tuple[Any, Dict[Tuple[int, int], str], Image.Image]]" = OrderedDict()
 
-def _tile_top_left(row: int, col: int, tile_size: int,
-                   min_row: int, min_col: int) -> Tuple[int, int]:
-    """Return pixel (x, y) of the tile's top‑left corner."""
-    x = TILE_GUTTER + (col - min_col) * (tile_size + TILE_GUTTER)
-    y = TILE_GUTTER + (row - min_row) * (tile_size + TILE_GUTTER)
-    return x, y
+# format → (file extension, default level)
+IMAGE_FORMATS: Dict[str, Tuple[str, int]] = {
+    "png":  ("png",  6),      # zlib level 0‥9
+    "png8": ("png",  6),      # palette-quantised, zlib level 0‥9
+    "webp": ("webp", 4),      # lossless, method/effort 0‥6
+    "jpeg": ("jpg",  85),     # quality 1‥95
+}
+IMAGE_LEVELS: Dict[str, Tuple[int, int]] = {
+    "png": (0, 9), "png8": (0, 9), "webp": (0, 6), "jpeg": (1, 95),
+}
 
+CHUNK_CELLS      = 8      # chunk edge, in board cells (tile + gutter)
+CHUNK_CACHE_SIZE = 64     # rendered chunks kept across all boards
+BG_COLOUR        = (30, 30, 30, 255)   # chunks skip board_bg.png (would need the full-size fit)
 
-def _tile_center(row: int, col: int, tile_size: int,
-                 min_row: int, min_col: int) -> Tuple[int, int]:
-    tlx, tly = _tile_top_left(row, col, tile_size, min_row, min_col)
-    return tlx + tile_size // 2, tly + tile_size // 2
+# chunk content hash → static chunk image
+_CHUNK_CACHE: "OrderedDict[str, Image.Image]" = OrderedDict()
+# (model.key, max_side) → (layout signature, chunk hashes, downscaled static overview)
+_OVERVIEW_CACHE: "OrderedDict[Tuple[str, int], Tuple[Any, Dict[Tuple[int, int], str], Image.Image]]" = OrderedDict()
+# model.key → {(chunk col, chunk row): ([tile idx], [(x1, y1, x2, y2) arrows], content hash)}
+_CHUNK_INDEX: "OrderedDict[str, Dict[Tuple[int, int], Tuple[List[int], List[Tuple[int, int, int, int]], str]]]" = OrderedDict()
 
 
 def _draw_arrow(canvas: Image.Image, x1: int, y1: int, x2: int, y2: int):
     ImageProcess.draw_arrow(canvas, x1, y1, x2, y2, width=ARROW_WIDTH)
 
 # ---------------------------------------------------------------------------
-# Public API
+# Layers
 # ---------------------------------------------------------------------------
 
-def generate_board(tiles: Dict[str, Dict[str, Any]],
-                   board_data: Dict[str, Any],
-                   teams: Dict[str, Dict[str, Any]] | None = None) -> None:
-    """Render game_board.png accommodating negative row/col indices."""
+BG_PATH = Path("images/backgrounds/board_bg.png")
 
-    # gather extents
-    rows = [t["coords"][0] for t in tiles.values()]
-    cols = [t["coords"][1] for t in tiles.values()]
-    min_row, max_row = min(rows), max(rows)
-    min_col, max_col = min(cols), max(cols)
-
-    tile_size = int(board_data.get("tile-size", 100))
-    width  = (max_col - min_col + 1) * (tile_size + TILE_GUTTER) + TILE_GUTTER
-    height = (max_row - min_row + 1) * (tile_size + TILE_GUTTER) + TILE_GUTTER
-
-    # ---------------- background ----------------
-    bg_path = Path("images/backgrounds/board_bg.png")
-    if bg_path.is_file():
-        bg = Image.open(bg_path).convert("RGBA")
-        bg = ImageOps.fit(bg, (width, height), Image.Resampling.LANCZOS)
-    else:
-        bg = Image.new("RGBA", (width, height), (30, 30, 30, 255))
 
-    canvas = bg.copy()
+def _draw_background(model: BoardModel) -> Image.Image:
+    if BG_PATH.is_file():
+        bg = Image.open(BG_PATH).convert("RGBA")
+        return ImageOps.fit(bg, (model.width, model.height), Image.Resampling.LANCZOS)
+    return Image.new("RGBA", (model.width, model.height), BG_COLOUR)
 
-    # ---------------- draw tiles ----------------
-    for tid, t in tiles.items():
-        r, c = t["coords"]
-        x, y = _tile_top_left(r, c, tile_size, min_row, min_col)
 
-        sprite_path = Path("images") / t["item-picture"]
-        if sprite_path.is_file():
-            tile_img = Image.open(sprite_path).convert("RGBA")
-            tile_img = ImageProcess.image_resizer(tile_img, board_data)
+def _draw_tiles(canvas: Image.Image, model: BoardModel) -> None:
+    tile_size = model.tile_size
+    for t in model.tiles:
+        x, y = t.x, t.y
+        tile_img = ImageProcess.tile_sprite(Path("images") / t.picture, model.board)
+        if tile_img is not None:
             canvas.alpha_composite(tile_img, (x, y))
         else:
             # placeholder box
             draw = ImageDraw.Draw(canvas)
             draw.rectangle([x, y, x + tile_size, y + tile_size], outline=(255,0,0), width=2)
 
-        # caption inside tile
+
+def _draw_captions(canvas: Image.Image, model: BoardModel) -> None:
+    # tiles never overlap, so captioning after every sprite is down is
+    # pixel-identical to captioning tile by tile
+    tile_size = model.tile_size
+    for t in model.tiles:
+        x, y = t.x, t.y
         crop = canvas.crop((x, y, x + tile_size, y + tile_size))
-        ImageProcess.add_text_to_image(crop, t["item-name"])
+        ImageProcess.add_text_to_image(crop, t.name)
+        canvas.alpha_composite(crop, (x, y))
+
+
+def _draw_arrows(canvas: Image.Image, model: BoardModel) -> None:
+    for t in model.tiles:
+        for j in t.next:
+            nxt = model.tiles[j]
+            _draw_arrow(canvas, t.cx, t.cy, nxt.cx, nxt.cy)
+
+
+def _render_static(model: BoardModel,
+                   timings: Dict[str, float] | None = None) -> Image.Image:
+    """
+    Background, tile sprites, captions and arrows – everything but tokens.
+    Pass a dict as *timings* to get seconds per stage back (benchmarks).
+    """
+    t0 = time.perf_counter()
+    canvas = _draw_background(model)
+    stamps = [("background", time.perf_counter())]
+    for name, stage in (("tiles", _draw_tiles), ("captions", _draw_captions),
+                        ("arrows", _draw_arrows)):
+        stage(canvas, model)
+        stamps.append((name, time.perf_counter()))
+
+    if timings is not None:
+        for name, t1 in stamps:
+            timings[name] = timings.get(name, 0.0) + t1 - t0
+            t0 = t1
+    return canvas
+
+
+def _draw_tokens(canvas: Image.Image, model: BoardModel,
+                 teams: Dict[str, Dict[str, Any]],
+                 origin: Tuple[int, int] = (0, 0)) -> None:
+    """Draw team tokens; *origin* is the board pixel at canvas (0, 0)."""
+    ox, oy = origin
+    token_radius = model.player_size // 2
+    by_tile: Dict[str, List[str]] = {}
+    for name, d in teams.items():
+        by_tile.setdefault(d["tile"], []).append(name)
+
+    grid_pos = [(-token_radius, -token_radius),
+                ( token_radius, -token_radius),
+                (-token_radius,  token_radius),
+                ( token_radius,  token_radius)]
+
+    for tid, team_list in by_tile.items():
+        if tid not in model:
+            continue
+        t = model.tile(tid)
+
+        for idx, tname in enumerate(team_list[:4]):
+            dx, dy = grid_pos[idx]
+            px, py = t.cx + dx - ox, t.cy + dy - oy
+
+            tok = ImageProcess.token_sprite(TOKEN_DIR / f"{tname}.png", model.board)
+            if tok is not None:
+                canvas.alpha_composite(tok, (px - token_radius, py - token_radius))
+            else:
+                # coloured circle fallback
+                colour = tuple((hash(tname+str(i)) & 0x7F) + 64 for i in range(3)) + (255,)
+                draw = ImageDraw.Draw(canvas)
+                draw.ellipse([(px-token_radius, py-token_radius),
+                              (px+token_radius, py+token_radius)],
+                             fill=colour, outline=(255,255,255))
+
+
+def _layout_sig(model: BoardModel) -> Tuple[int, int, str]:
+    """Two layers with the same signature differ only where chunk hashes do."""
+    return model.width, model.height, json.dumps(model.board, sort_keys=True, default=str)
+
+
+def _take_latest(cache: "OrderedDict", sig: Any, match=lambda key: True):
+    """
+    Remove and return the most recent (chunk hashes, image) in *cache* with
+    layout *sig*, if any – it gets patched in place, which is far cheaper
+    than copying a full-size layer.
+    """
+    for key in reversed(cache):
+        old_sig, hashes, img = cache[key]
+        if old_sig == sig and match(key):
+            del cache[key]
+            return hashes, img
+    return None
+
+
+def _patch_static(model: BoardModel, layer: Image.Image,
+                  dirty: List[Tuple[int, int]]) -> Image.Image:
+    """Repaint the *dirty* chunks of *layer* (in place) for *model*."""
+    size = _chunk_px(model)
+    bg = _draw_background(model) if dirty and BG_PATH.is_file() else None
+    for cx, cy in dirty:
+        box = (cx * size, cy * size,
+               min((cx + 1) * size, model.width), min((cy + 1) * size, model.height))
+        base = bg.crop(box) if bg is not None else None
+        layer.paste(_render_chunk(model, cx, cy, base), box[:2])
+    return layer
+
+
+def static_layer(model: BoardModel,
+                 timings: Dict[str, float] | None = None) -> Image.Image:
+    """
+    Cached static layer for this board, keyed on ``model.key`` (a hash of
+    tiles + board settings computed once at compile time). On a miss the
+    previous layer with the same layout is taken over and patched chunk
+    by chunk.
+    Callers must treat the returned image as read-only. *timings* only
+    gets stage entries on a full render.
+    """
+    hit = _STATIC_CACHE.get(model.key)
+    if hit is not None:
+        _STATIC_CACHE.move_to_end(model.key)
+        return hit[2]
+
+    sig, hashes = _layout_sig(model), _chunk_hashes(model)
+    prev = _take_latest(_STATIC_CACHE, sig)
+    if prev is not None:
+        base = _patch_static(model, prev[1], _dirty_chunks(model, prev[0], hashes))
+    else:
+        base = _render_static(model, timings)
+    _STATIC_CACHE[model.key] = (sig, hashes, base)
+    while len(_STATIC_CACHE) > STATIC_CACHE_SIZE:
+        _STATIC_CACHE.popitem(last=False)
+    return base
+
+# ---------------------------------------------------------------------------
+# Chunked static layer (viewport / overview)
+# ---------------------------------------------------------------------------
+
+def _chunk_px(model: BoardModel) -> int:
+    return CHUNK_CELLS * (model.tile_size + TILE_GUTTER)
+
+
+def _chunk_index(model: BoardModel):
+    """Bucket tiles and arrows by the chunks they touch (once per board)."""
+    idx = _CHUNK_INDEX.get(model.key)
+    if idx is not None:
+        return idx
+
+    size = _chunk_px(model)
+    pad  = ARROW_WIDTH + 12                       # arrow-head overhang
+    buckets: Dict[Tuple[int, int], Tuple[List[int], List[Tuple[int, int, int, int]]]] = {}
+    for t in model.tiles:
+        buckets.setdefault((t.x // size, t.y // size), ([], []))[0].append(t.idx)
+        for j in t.next:
+            n = model.tiles[j]
+            x0, x1 = sorted((t.cx, n.cx))
+            y0, y1 = sorted((t.cy, n.cy))
+            for cx in range((x0 - pad) // size, (x1 + pad) // size + 1):
+                for cy in range((y0 - pad) // size, (y1 + pad) // size + 1):
+                    buckets.setdefault((cx, cy), ([], []))[1].append((t.cx, t.cy, n.cx, n.cy))
+
+    # content hash: everything _render_chunk draws, plus the settings sprites use
+    board = json.dumps(model.board, sort_keys=True, default=str)
+    idx = {}
+    for (cx, cy), (tile_ids, arrows) in buckets.items():
+        w = min(size, model.width - cx * size)
+        h = min(size, model.height - cy * size)
+        tiles = [(model.tiles[i].x, model.tiles[i].y, model.tiles[i].picture,
+                  model.tiles[i].name) for i in tile_ids]
+        blob = repr((board, cx, cy, w, h, tiles, sorted(arrows)))
+        idx[(cx, cy)] = (tile_ids, arrows, hashlib.sha1(blob.encode("utf-8")).hexdigest())
+
+    _CHUNK_INDEX[model.key] = idx
+    while len(_CHUNK_INDEX) > STATIC_CACHE_SIZE:
+        _CHUNK_INDEX.popitem(last=False)
+    return idx
+
+
+def _chunk_hashes(model: BoardModel) -> Dict[Tuple[int, int], str]:
+    return {k: v[2] for k, v in _chunk_index(model).items()}
+
+
+def _dirty_chunks(model: BoardModel, old: Dict[Tuple[int, int], str],
+                  new: Dict[Tuple[int, int], str]) -> List[Tuple[int, int]]:
+    """On-board chunks whose content hash differs between *old* and *new*."""
+    size = _chunk_px(model)
+    cols, rows = (model.width - 1) // size + 1, (model.height - 1) // size + 1
+    return [(cx, cy) for cx, cy in old.keys() | new.keys()
+            if old.get((cx, cy)) != new.get((cx, cy)) and 0 <= cx < cols and 0 <= cy < rows]
+
+
+def _render_chunk(model: BoardModel, cx: int, cy: int,
+                  base: Image.Image | None = None) -> Image.Image:
+    """Static chunk (cx, cy), drawn on *base* (its background) or plain BG_COLOUR."""
+    size = _chunk_px(model)
+    x0, y0 = cx * size, cy * size
+    w = min(size, model.width - x0)
+    h = min(size, model.height - y0)
+    canvas = base if base is not None else Image.new("RGBA", (w, h), BG_COLOUR)
+    tile_ids, arrows, _ = _chunk_index(model).get((cx, cy), ([], [], None))
+    ts = model.tile_size
+
+    for i in tile_ids:
+        t = model.tiles[i]
+        x, y = t.x - x0, t.y - y0
+        tile_img = ImageProcess.tile_sprite(Path("images") / t.picture, model.board)
+        if tile_img is not None:
+            canvas.alpha_composite(tile_img, (x, y))
+        else:
+            ImageDraw.Draw(canvas).rectangle([x, y, x + ts, y + ts], outline=(255,0,0), width=2)
+        crop = canvas.crop((x, y, x + ts, y + ts))
+        ImageProcess.add_text_to_image(crop, t.name)
         canvas.alpha_composite(crop, (x, y))
 
-    # ---------------- arrows ----------------
-    for tid, t in tiles.items():
-        r, c = t["coords"]
-        cx1, cy1 = _tile_center(r, c, tile_size, min_row, min_col)
-        for nxt in t.get("next", []):
-            if nxt not in tiles:
+    for ax1, ay1, ax2, ay2 in arrows:
+        _draw_arrow(canvas, ax1 - x0, ay1 - y0, ax2 - x0, ay2 - y0)
+    return canvas
+
+
+def _chunk(model: BoardModel, cx: int, cy: int) -> Image.Image:
+    entry = _chunk_index(model).get((cx, cy))
+    if entry is None:                                # nothing on it
+        return _render_chunk(model, cx, cy)
+    key = entry[2]
+    img = _CHUNK_CACHE.get(key)
+    if img is None:
+        img = _CHUNK_CACHE[key] = _render_chunk(model, cx, cy)
+        while len(_CHUNK_CACHE) > CHUNK_CACHE_SIZE:
+            _CHUNK_CACHE.popitem(last=False)
+    else:
+        _CHUNK_CACHE.move_to_end(key)
+    return img
+
+
+def render_region(model: BoardModel, box: Tuple[int, int, int, int],
+                  teams: Dict[str, Dict[str, Any]] | None = None) -> Image.Image:
+    """Board pixels inside *box* (x0, y0, x1, y1), assembled from chunks."""
+    x0, y0 = max(box[0], 0), max(box[1], 0)
+    x1, y1 = min(box[2], model.width), min(box[3], model.height)
+    canvas = Image.new("RGBA", (max(x1 - x0, 1), max(y1 - y0, 1)), BG_COLOUR)
+
+    size = _chunk_px(model)
+    for cy in range(y0 // size, (y1 - 1) // size + 1):
+        for cx in range(x0 // size, (x1 - 1) // size + 1):
+            img = _chunk(model, cx, cy)
+            # part of this chunk that falls inside the box
+            left, top = max(x0 - cx * size, 0), max(y0 - cy * size, 0)
+            right  = min(x1 - cx * size, img.width)
+            bottom = min(y1 - cy * size, img.height)
+            canvas.alpha_composite(img, (cx * size + left - x0, cy * size + top - y0),
+                                   (left, top, right, bottom))
+
+    if teams:
+        _draw_tokens(canvas, model, teams, origin=(x0, y0))
+    return canvas
+
+
+def render_viewport(model: BoardModel, teams: Dict[str, Dict[str, Any]] | None,
+                    tile: str, radius: int = 3) -> Image.Image:
+    """Crop of *radius* cells around *tile* (tokens included)."""
+    t = model.tile(tile)
+    reach = radius * (model.tile_size + TILE_GUTTER) + model.tile_size // 2 + TILE_GUTTER
+    return render_region(model, (t.cx - reach, t.cy - reach, t.cx + reach, t.cy + reach), teams)
+
+
+def _overview_static(model: BoardModel, max_side: int, scale: float) -> Image.Image:
+    """
+    Downscaled static layer, built chunk by chunk so the full-resolution
+    board never exists in memory at once. Chunks are rendered straight,
+    not through the chunk LRU: one full scan would evict the very set it
+    is scanning. Cached per board (patched from the previous one with the
+    same layout after a sync); treat as read-only.
+    """
+    key = (model.key, max_side)
+    hit = _OVERVIEW_CACHE.get(key)
+    if hit is not None:
+        _OVERVIEW_CACHE.move_to_end(key)
+        return hit[2]
+
+    sig, hashes = _layout_sig(model), _chunk_hashes(model)
+    size = _chunk_px(model)
+    prev = _take_latest(_OVERVIEW_CACHE, sig, lambda k: k[1] == max_side)
+    if prev is not None:
+        out, todo = prev[1], _dirty_chunks(model, prev[0], hashes)
+    else:
+        out  = Image.new("RGBA", (max(int(model.width * scale), 1),
+                                  max(int(model.height * scale), 1)), BG_COLOUR)
+        todo = _dirty_chunks(model, {}, hashes)      # empty background chunks are skipped
+
+    for cx, cy in todo:
+        img = _render_chunk(model, cx, cy)
+        x, y = int(cx * size * scale), int(cy * size * scale)
+        w = max(int((cx * size + img.width) * scale) - x, 1)
+        h = max(int((cy * size + img.height) * scale) - y, 1)
+        out.paste(BG_COLOUR, (x, y, x + w, y + h))
+        out.alpha_composite(img.resize((w, h), Image.Resampling.BILINEAR), (x, y))
+
+    _OVERVIEW_CACHE[key] = (sig, hashes, out)
+    while len(_OVERVIEW_CACHE) > STATIC_CACHE_SIZE:
+        _OVERVIEW_CACHE.popitem(last=False)
+    return out
+
+
+def render_overview(model: BoardModel, teams: Dict[str, Dict[str, Any]] | None,
+                    max_side: int = 2048) -> Image.Image:
+    """Whole board scaled to fit *max_side*: cached static overview + token dots."""
+    scale = min(1.0, max_side / max(model.width, model.height))
+    if scale >= 1.0:
+        return render_board(model, teams)
+
+    out = _overview_static(model, max_side, scale).copy()
+    if teams:                                         # tokens as dots at this scale
+        r = max(int(model.player_size * scale) // 2, 3)
+        draw = ImageDraw.Draw(out)
+        for i, (tname, d) in enumerate(teams.items()):
+            if d["tile"] not in model:
                 continue
-            nr, nc = tiles[nxt]["coords"]
-            cx2, cy2 = _tile_center(nr, nc, tile_size, min_row, min_col)
-            _draw_arrow(canvas, cx1, cy1, cx2, cy2)
+            t = model.tile(d["tile"])
+            px = int(t.cx * scale) + (i % 2) * r * 2 - r
+            py = int(t.cy * scale) + (i // 2 % 2) * r * 2 - r
+            colour = tuple((hash(tname+str(k)) & 0x7F) + 64 for k in range(3)) + (255,)
+            draw.ellipse([(px - r, py - r), (px + r, py + r)], fill=colour, outline=(255,255,255))
+    return out
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def render_board(model: BoardModel,
+                 teams: Dict[str, Dict[str, Any]] | None = None,
+                 timings: Dict[str, float] | None = None) -> Image.Image:
+    """Cached static layer + per-call token layer, as a fresh RGBA image."""
+    canvas = static_layer(model, timings).copy()
 
     # ---------------- team tokens ----------------
+    t0 = time.perf_counter()
     if teams:
-        player_size  = int(board_data.get("player-size", 40))
-        token_radius = player_size // 2
-        by_tile: Dict[str, List[str]] = {}
-        for name, d in teams.items():
-            by_tile.setdefault(d["tile"], []).append(name)
-
-        for tid, team_list in by_tile.items():
-            if tid not in tiles:
-                continue
-            row, col = tiles[tid]["coords"]
-            cx, cy = _tile_center(row, col, tile_size, min_row, min_col)
-
-            grid_pos = [(-token_radius, -token_radius),
-                        ( token_radius, -token_radius),
-                        (-token_radius,  token_radius),
-                        ( token_radius,  token_radius)]
-
-            for idx, tname in enumerate(team_list[:4]):
-                dx, dy = grid_pos[idx]
-                px, py = cx + dx, cy + dy
-
-                sprite = TOKEN_DIR / f"{tname}.png"
-                if sprite.is_file():
-                    tok = Image.open(sprite).convert("RGBA")
-                    tok = ImageProcess.player_image_resizer(tok, board_data)
-                    canvas.alpha_composite(tok, (px - token_radius, py - token_radius))
-                else:
-                    # coloured circle fallback
-                    colour = tuple((hash(tname+str(i)) & 0x7F) + 64 for i in range(3)) + (255,)
-                    draw = ImageDraw.Draw(canvas)
-                    draw.ellipse([(px-token_radius, py-token_radius),
-                                  (px+token_radius, py+token_radius)],
-                                 fill=colour, outline=(255,255,255))
+        _draw_tokens(canvas, model, teams)
+    if timings is not None:
+        timings["tokens"] = time.perf_counter() - t0
+    return canvas
+
+
+def _encode_timed(img: Image.Image, board: Dict[str, Any], fmt: str | None,
+                  timings: Dict[str, float] | None) -> bytes:
+    t0 = time.perf_counter()
+    data = encode_image(img, *output_format(board, fmt))
+    if timings is not None:
+        timings["encode"] = time.perf_counter() - t0
+    return data
+
 
+def board_png_bytes(model: BoardModel,
+                    teams: Dict[str, Dict[str, Any]] | None = None,
+                    fmt: str | None = None,
+                    timings: Dict[str, float] | None = None) -> bytes:
+    """
+    Render the board and encode it (PNG unless configured otherwise).
+    Pass a dict as *timings* to get seconds per stage back.
+    """
+    return _encode_timed(render_board(model, teams, timings), model.board, fmt, timings)
+
+
+def generate_board(model: BoardModel,
+                   teams: Dict[str, Dict[str, Any]] | None = None) -> None:
+    """Render game_board.png accommodating negative row/col indices."""
+    canvas = render_board(model, teams)
     canvas.save("game_board.png")
-    print(f"[board] saved game_board.png  ({width}×{height})")
+    print(f"[board] saved game_board.png  ({canvas.width}×{canvas.height})")
+
+
+def viewport_png_bytes(model: BoardModel, teams: Dict[str, Dict[str, Any]] | None,
+                       tile: str, radius: int = 3, fmt: str | None = None,
+                       timings: Dict[str, float] | None = None) -> bytes:
+    t0  = time.perf_counter()
+    img = render_viewport(model, teams, tile, radius)
+    if timings is not None:
+        timings["viewport"] = time.perf_counter() - t0
+    return _encode_timed(img, model.board, fmt, timings)
+
+
+def overview_png_bytes(model: BoardModel, teams: Dict[str, Dict[str, Any]] | None,
+                       max_side: int = 2048, fmt: str | None = None,
+                       timings: Dict[str, float] | None = None) -> bytes:
+    t0  = time.perf_counter()
+    img = render_overview(model, teams, max_side)
+    if timings is not None:
+        timings["overview"] = time.perf_counter() - t0
+    return _encode_timed(img, model.board, fmt, timings)
+
+# ---------------------------------------------------------------------------
+# Output encoding
+# ---------------------------------------------------------------------------
+
+def output_format(board: Dict[str, Any], fmt: str | None = None) -> Tuple[str, int]:
+    """
+    (format, level) for uploads. *fmt* wins, then $BOARD_IMAGE_FORMAT,
+    then the board's "image-format"; level from $BOARD_IMAGE_LEVEL or
+    "image-level" (zlib level for PNG, quality for JPEG, effort for WebP).
+    """
+    fmt = (fmt or os.getenv("BOARD_IMAGE_FORMAT") or board.get("image-format") or "png").lower()
+    if fmt not in IMAGE_FORMATS:
+        raise ValueError(f"unknown image format {fmt!r} (choose from {', '.join(IMAGE_FORMATS)})")
+    level = os.getenv("BOARD_IMAGE_LEVEL") or board.get("image-level")
+    if level in (None, ""):
+        return fmt, IMAGE_FORMATS[fmt][1]
+    lo, hi = IMAGE_LEVELS[fmt]
+    try:
+        level = int(level)
+    except (TypeError, ValueError):
+        raise ValueError(f"image level {level!r} is not an integer") from None
+    if not lo <= level <= hi:
+        raise ValueError(f"image level {level} out of range {lo}‥{hi} for {fmt}")
+    return fmt, level
+
+
+def output_filename(board: Dict[str, Any], stem: str, fmt: str | None = None) -> str:
+    return f"{stem}.{IMAGE_FORMATS[output_format(board, fmt)[0]][0]}"
+
+
+def encode_image(img: Image.Image, fmt: str = "png", level: int | None = None) -> bytes:
+    """Encode *img* as png | png8 | webp | jpeg (see IMAGE_FORMATS)."""
+    if level is None:
+        level = IMAGE_FORMATS[fmt][1]
+    buf = io.BytesIO()
+    if fmt == "png":
+        img.save(buf, format="PNG", compress_level=level)
+    elif fmt == "png8":                          # 256-colour palette, keeps alpha
+        img.quantize(colors=256, method=Image.Quantize.FASTOCTREE).save(
+            buf, format="PNG", compress_level=level)
+    elif fmt == "webp":
+        img.save(buf, format="WEBP", lossless=True, quality=100, method=level)
+    elif fmt == "jpeg":                          # no alpha – flatten onto board bg
+        flat = Image.new("RGB", img.size, BG_COLOUR[:3])
+        flat.paste(img, mask=img.getchannel("A"))
+        flat.save(buf, format="JPEG", quality=level, optimize=True)
+    else:
+        raise ValueError(f"unknown image format {fmt!r}")
+    return buf.getvalue()
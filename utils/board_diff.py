@@ -0,0 +1,90 @@
+"""utils/board_diff.py – structured diff between two board/team configs
+
+Used by /syncsheet to apply only what changed in the sheet instead of
+swapping ``tiles``/``teams`` wholesale.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Set, Tuple
+
+from utils.move_index import tile_edges
+
+Edge = Tuple[str, str]
+
+# team keys that are live game state, not sheet config
+TEAM_STATE_KEYS = ("tile", "rerolls", "skips", "last_roll", "pending_paths", "pending_message",
+                   "history")
+
+
+@dataclass
+class BoardDiff:
+    board_changed:   bool      = False
+    tiles_added:     List[str] = field(default_factory=list)
+    tiles_removed:   List[str] = field(default_factory=list)
+    tiles_changed:   List[str] = field(default_factory=list)
+    edges_added:     Set[Edge] = field(default_factory=set)
+    edges_removed:   Set[Edge] = field(default_factory=set)
+    teams_added:     List[str] = field(default_factory=list)
+    teams_removed:   List[str] = field(default_factory=list)
+    teams_changed:   List[str] = field(default_factory=list)   # config, not position
+    members_changed: List[str] = field(default_factory=list)
+
+    @property
+    def tiles_touched(self) -> bool:
+        return bool(self.board_changed or self.tiles_added
+                    or self.tiles_removed or self.tiles_changed)
+
+    def empty(self) -> bool:
+        return not (self.tiles_touched or self.teams_added
+                    or self.teams_removed or self.teams_changed)
+
+    def summary(self) -> str:
+        if self.empty():
+            return "no changes"
+        parts = []
+        for label, n in (("tiles +", len(self.tiles_added)),
+                         ("tiles −", len(self.tiles_removed)),
+                         ("tiles ~", len(self.tiles_changed)),
+                         ("edges +", len(self.edges_added)),
+                         ("edges −", len(self.edges_removed)),
+                         ("teams +", len(self.teams_added)),
+                         ("teams −", len(self.teams_removed)),
+                         ("teams ~", len(self.teams_changed))):
+            if n:
+                parts.append(f"{label}{n}")
+        if self.board_changed:
+            parts.append("board settings")
+        return ", ".join(parts)
+
+
+def _team_config(team: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in team.items() if k not in TEAM_STATE_KEYS}
+
+
+def diff_board(old_board: Dict[str, Any], old_tiles: Dict[str, Dict[str, Any]],
+               old_teams: Dict[str, Dict[str, Any]],
+               new_board: Dict[str, Any], new_tiles: Dict[str, Dict[str, Any]],
+               new_teams: Dict[str, Dict[str, Any]]) -> BoardDiff:
+    d = BoardDiff(board_changed=old_board != new_board)
+
+    d.tiles_added   = [t for t in new_tiles if t not in old_tiles]
+    d.tiles_removed = [t for t in old_tiles if t not in new_tiles]
+    d.tiles_changed = [t for t in new_tiles
+                       if t in old_tiles and old_tiles[t] != new_tiles[t]]
+
+    old_edges, new_edges = tile_edges(old_tiles), tile_edges(new_tiles)
+    d.edges_added   = new_edges - old_edges
+    d.edges_removed = old_edges - new_edges
+
+    d.teams_added   = [t for t in new_teams if t not in old_teams]
+    d.teams_removed = [t for t in old_teams if t not in new_teams]
+    for name in new_teams:
+        if name not in old_teams:
+            continue
+        old, new = old_teams[name], new_teams[name]
+        if _team_config(old) != _team_config(new):
+            d.teams_changed.append(name)
+        if set(map(str, old.get("members", []))) != set(map(str, new.get("members", []))):
+            d.members_changed.append(name)
+    return d
@@ -0,0 +1,96 @@
+"""utils/board_model.py – compiled, read-only view of a validated board
+
+``BoardModel.compile(board_data, tiles)`` walks the nested config dicts
+once and produces:
+  • integer tile indices (``index``: tile ID → idx)
+  • ``__slots__`` tile records with pixel geometry already resolved
+  • successor index tuples per tile (for drawing arrows; moves are
+    resolved by utils/move_index on the tile-ID graph)
+  • board extents, canvas size and a layout hash (``key``)
+Renderers and main.py read from the model instead of re-walking
+``tiles[...]["coords"]`` on every call. Recompile after /syncsheet.
+"""
+from __future__ import annotations
+
+import hashlib, json
+from typing import Dict, Any, List
+
+# ---------------------------------------------------------------------------
+# Geometry
+# ---------------------------------------------------------------------------
+TILE_GUTTER = 10          # px gap around every square
+
+
+class TileRecord:
+    __slots__ = ("idx", "id", "row", "col", "name", "picture",
+                 "next", "x", "y", "cx", "cy")
+
+    def __init__(self, **kw: Any):
+        for k in self.__slots__:
+            setattr(self, k, kw[k])
+
+    def __repr__(self) -> str:
+        return f"TileRecord({self.id!r} @ {self.row},{self.col})"
+
+
+class BoardModel:
+    __slots__ = ("board", "tiles", "index", "min_row", "max_row",
+                 "min_col", "max_col", "tile_size", "player_size",
+                 "width", "height", "key")
+
+    # ------------------------------------------------------------------- #
+    # Construction
+    # ------------------------------------------------------------------- #
+    @classmethod
+    def compile(cls, board_data: Dict[str, Any],
+                tiles: Dict[str, Dict[str, Any]]) -> "BoardModel":
+        """Build from already-validated config dicts (see ``ETL.validate``)."""
+        m = cls()
+        m.board       = dict(board_data)
+        m.tile_size   = int(board_data["tile-size"])
+        m.player_size = int(board_data["player-size"])
+        m.index       = {tid: i for i, tid in enumerate(tiles)}
+
+        rows = [t["coords"][0] for t in tiles.values()] or [0]
+        cols = [t["coords"][1] for t in tiles.values()] or [0]
+        m.min_row, m.max_row = min(rows), max(rows)
+        m.min_col, m.max_col = min(cols), max(cols)
+
+        step = m.tile_size + TILE_GUTTER
+        m.width  = (m.max_col - m.min_col + 1) * step + TILE_GUTTER
+        m.height = (m.max_row - m.min_row + 1) * step + TILE_GUTTER
+
+        recs: List[TileRecord] = []
+        for i, (tid, t) in enumerate(tiles.items()):
+            r, c = int(t["coords"][0]), int(t["coords"][1])
+            x = TILE_GUTTER + (c - m.min_col) * step
+            y = TILE_GUTTER + (r - m.min_row) * step
+            nxt = tuple(m.index[n] for n in t.get("next", []) if n in m.index)
+            recs.append(TileRecord(
+                idx=i, id=tid, row=r, col=c,
+                name=t.get("item-name", ""), picture=t.get("item-picture", ""),
+                next=nxt,
+                x=x, y=y, cx=x + m.tile_size // 2, cy=y + m.tile_size // 2,
+            ))
+        m.tiles = tuple(recs)
+
+        blob = json.dumps([tiles, m.board], sort_keys=True, default=str)
+        m.key = hashlib.sha1(blob.encode("utf-8")).hexdigest()
+        return m
+
+    # ------------------------------------------------------------------- #
+    # Lookups
+    # ------------------------------------------------------------------- #
+    def __len__(self) -> int:
+        return len(self.tiles)
+
+    def __contains__(self, tid: str) -> bool:
+        return tid in self.index
+
+    def tile(self, tid: str) -> TileRecord:
+        return self.tiles[self.index[tid]]
+
+    def name(self, tid: str) -> str:
+        """Display name for *tid* (falls back to the ID for unknown tiles)."""
+        i = self.index.get(tid)
+        return self.tiles[i].name if i is not None else tid
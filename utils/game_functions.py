@@ -1,6 +1,8 @@
 import random
 import secrets 
-from typing import Dict
+from typing import Dict, Set
+
+_UNKNOWN_USERS: Set[str] = set()         # non-participants already warned about
 
 
 class GameUtils:
@@ -35,17 +37,41 @@ class GameUtils:
     # Team lookup
     # ------------------------------------------------------------------ #
     @staticmethod
-    def find_team_name(user, teams: Dict[str, Dict]) -> str | None:
+    def build_member_index(teams: Dict[str, Dict]) -> Dict[str, str]:
+        """Map every member ID (as string) to its team name."""
+        return {str(uid): name
+                for name, data in teams.items()
+                for uid in data.get("members", [])}
+
+    @staticmethod
+    def reindex_team(index: Dict[str, str], team: str, members) -> None:
+        """Replace *team*'s entries in *index* with *members* (empty = drop team)."""
+        for uid in [u for u, t in index.items() if t == team]:
+            del index[uid]
+        for uid in members:
+            index[str(uid)] = team
+
+    @staticmethod
+    def find_team_name(user, teams: Dict[str, Dict],
+                       index: Dict[str, str] | None = None) -> str | None:
         """
         Return the team name this Discord *user* belongs to.
-        Logs a warning if the user ID isn’t found in any team’s ``members`` list.
+        With *index* (see ``build_member_index``) this is one dict lookup;
+        without it every team's ``members`` list is scanned.
+        Logs a warning the first time a user ID isn’t found in any team.
         """
         uid = str(user.id)                       # always compare as string
-        for name, data in teams.items():
-            if uid in data.get("members", []):
+        if index is not None:
+            name = index.get(uid)
+            if name is not None:
                 return name
+        else:
+            for name, data in teams.items():
+                if uid in data.get("members", []):
+                    return name
 
-        # --- not found → warn in logs ---
-        print(f"[WARN] No team found for user {uid} ({user.display_name})")
+        # --- not found → warn in logs (once per user) ---
+        if uid not in _UNKNOWN_USERS:
+            _UNKNOWN_USERS.add(uid)
+            print(f"[WARN] No team found for user {uid} ({user.display_name})")
         return None
-
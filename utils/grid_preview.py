@@ -1,46 +1,43 @@
 # utils/grid_preview.py  (updated for negative coords)
+#
+# The planning grid only depends on tile IDs, coords and tile size, so the
+# PNG is cached in memory on a hash of exactly those; /grid never touches disk.
+import hashlib, io
+from collections import OrderedDict
 from pathlib import Path
-from typing  import Dict, Any
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 
-FONT_PATH   = Path("assets/fonts/DejaVuSans-Bold.ttf")
-TILE_GUTTER = 10
+from utils.board_model import BoardModel, TILE_GUTTER
+from utils.image_processor import ImageProcess
 
-def render_empty_grid(board: Dict[str, Any],
-                      tiles: Dict[str, Dict[str, Any]],
-                      out_file: str = "grid_preview.png") -> Path:
-    tile = int(board.get("tile-size", 100))
+GRID_CACHE_SIZE = 4
+
+_GRID_CACHE: "OrderedDict[str, bytes]" = OrderedDict()   # layout hash → PNG
 
-    # --- extents --------------------------------------------------------
-    rows = [t["coords"][0] for t in tiles.values()]
-    cols = [t["coords"][1] for t in tiles.values()]
-    min_r, max_r = min(rows), max(rows)
-    min_c, max_c = min(cols), max(cols)
+def _layout_key(model: BoardModel) -> str:
+    h = hashlib.sha1(str(model.tile_size).encode())
+    for t in model.tiles:
+        h.update(f"|{t.id}:{t.row},{t.col}".encode("utf-8"))
+    return h.hexdigest()
 
-    n_rows = max_r - min_r + 1
-    n_cols = max_c - min_c + 1
+def _render(model: BoardModel) -> Image.Image:
+    tile = model.tile_size
+    min_r, max_r = model.min_row, model.max_row
+    min_c, max_c = model.min_col, model.max_col
 
-    W = n_cols * (tile + TILE_GUTTER) + TILE_GUTTER
-    H = n_rows * (tile + TILE_GUTTER) + TILE_GUTTER
+    W, H = model.width, model.height
 
     img  = Image.new("RGBA", (W, H), (45, 45, 45, 255))
     draw = ImageDraw.Draw(img)
 
-    try:
-        font = ImageFont.truetype(str(FONT_PATH), tile // 4)
-    except OSError:
-        font = ImageFont.load_default()
+    font = ImageProcess.font(tile // 4)
 
     # --- draw grid boxes & IDs -----------------------------------------
-    for tid, t in tiles.items():
-        r, c = t["coords"]
-        # shift by min_r/min_c so every tile lands on canvas
-        x = TILE_GUTTER + (c - min_c) * (tile + TILE_GUTTER)
-        y = TILE_GUTTER + (r - min_r) * (tile + TILE_GUTTER)
-
-        draw.rectangle([x, y, x + tile, y + tile],
+    for t in model.tiles:
+        # tile positions are already shifted by min_r/min_c in the model
+        draw.rectangle([t.x, t.y, t.x + tile, t.y + tile],
                        outline=(255, 255, 255, 180), width=2)
-        draw.text((x + 4, y + 4), tid, font=font, fill="white")
+        draw.text((t.x + 4, t.y + 4), t.id, font=font, fill="white")
 
     # --- axis labels ----------------------------------------------------
     for idx, c in enumerate(range(min_c, max_c + 1)):
@@ -51,6 +48,27 @@ def render_empty_grid(board: Dict[str, Any],
         y = TILE_GUTTER + idx * (tile + TILE_GUTTER) + tile // 2
         draw.text((5, y), str(r), font=font, fill="white", anchor="lm")
 
-    img.save(out_file)
-    print(f"[grid] saved {out_file}  ({W}×{H})")
+    return img
+
+def grid_png_bytes(model: BoardModel) -> bytes:
+    """PNG of the empty planning grid, cached per layout."""
+    key = _layout_key(model)
+    png = _GRID_CACHE.get(key)
+    if png is not None:
+        _GRID_CACHE.move_to_end(key)
+        return png
+
+    buf = io.BytesIO()
+    _render(model).save(buf, format="PNG")
+    png = _GRID_CACHE[key] = buf.getvalue()
+    while len(_GRID_CACHE) > GRID_CACHE_SIZE:
+        _GRID_CACHE.popitem(last=False)
+    print(f"[grid] rendered {model.width}×{model.height} ({len(png)} bytes)")
+    return png
+
+def render_empty_grid(model: BoardModel,
+                      out_file: str = "grid_preview.png") -> Path:
+    """Write the grid to *out_file* (offline use; the bot uses grid_png_bytes)."""
+    Path(out_file).write_bytes(grid_png_bytes(model))
+    print(f"[grid] saved {out_file}  ({model.width}×{model.height})")
     return Path(out_file)
@@ -4,13 +4,17 @@ utils/image_processor.py – Pillow helpers
 -----------------------------------------
 * tile sprite maker (square, caption band inside)
 * token resizer
-* adaptive caption that shrinks to fit
+* adaptive caption that shrinks to fit (fonts + layouts memoised)
 * straight arrow primitive
+* bounded LRU cache of processed tile / token sprites
 """
 
+import stat
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Tuple
 
 # --------------------------------------------------------------------------- #
 # Constants
@@ -20,6 +24,64 @@ DEFAULT_FONT_SIZE = 14
 BORDER_COLOUR     = (255, 255, 255, 255)
 TILE_BG           = (45, 45, 45, 255)
 TEXT_COLOUR       = (255, 255, 255, 255)
+SPRITE_CACHE_SIZE = 512                 # processed sprites kept (~40 KB each @100px)
+
+# (path, mtime_ns, kind, size) → processed RGBA sprite
+_SPRITES: "OrderedDict[Tuple[str, int, str, int], Image.Image]" = OrderedDict()
+_SPRITE_STATS = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+@lru_cache(maxsize=None)
+def _font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    try:
+        return ImageFont.truetype(str(FONT_PATH), size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=4096)
+def _caption_layout(text: str, width: int, height: int,
+                    font_size: int) -> Tuple[int, int, int]:
+    """Largest size ≤ *font_size* that fits *width*, plus its (x, y)."""
+    target_w = width - 8
+    size = font_size
+    while size >= 8:
+        text_w = _font(size).getlength(text)
+        if text_w <= target_w:
+            break
+        size -= 1
+    draw_size = max(size, 8)              # font actually used
+    x = int((width - text_w) // 2)
+    y = height - size - 2
+    return draw_size, x, y
+
+
+def _cached_sprite(path: Path, kind: str, size: int,
+                   build: Callable[[Image.Image], Image.Image]) -> Image.Image | None:
+    """Load + process *path* once per (mtime, size); None if it's missing."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    mtime = st.st_mtime_ns
+
+    key = (str(path), mtime, kind, size)
+    sprite = _SPRITES.get(key)
+    if sprite is not None:
+        _SPRITES.move_to_end(key)
+        _SPRITE_STATS["hits"] += 1
+        return sprite
+
+    _SPRITE_STATS["misses"] += 1
+    with Image.open(path) as raw:
+        sprite = build(raw.convert("RGBA"))
+    _SPRITES[key] = sprite
+    while len(_SPRITES) > SPRITE_CACHE_SIZE:
+        _SPRITES.popitem(last=False)
+        _SPRITE_STATS["evictions"] += 1
+    return sprite
 
 
 class ImageProcess:
@@ -67,6 +129,23 @@ class ImageProcess:
         token.alpha_composite(img, (x, y))
         return token
 
+    # ------------------------------------------------------------------- #
+    # Cached sprite loaders (returned images are shared – don't mutate)
+    # ------------------------------------------------------------------- #
+    @staticmethod
+    def tile_sprite(path: Path, ctx: Dict[str, Any]) -> Image.Image | None:
+        return _cached_sprite(path, "tile", int(ctx["tile-size"]),
+                              lambda img: ImageProcess.image_resizer(img, ctx))
+
+    @staticmethod
+    def token_sprite(path: Path, ctx: Dict[str, Any]) -> Image.Image | None:
+        return _cached_sprite(path, "token", int(ctx["player-size"]),
+                              lambda img: ImageProcess.player_image_resizer(img, ctx))
+
+    @staticmethod
+    def sprite_cache_stats() -> Dict[str, int]:
+        return {**_SPRITE_STATS, "size": len(_SPRITES)}
+
     # ------------------------------------------------------------------- #
     # Caption helper
     # ------------------------------------------------------------------- #
@@ -76,22 +155,14 @@ class ImageProcess:
         if not text:
             return
 
-        target_w  = image.width - 8
-        font_size = font_size or DEFAULT_FONT_SIZE
-        while font_size >= 8:
-            try:
-                font = ImageFont.truetype(str(FONT_PATH), font_size)
-            except FileNotFoundError:
-                font = ImageFont.load_default()
-            text_w = ImageDraw.Draw(image).textlength(text, font=font)
-            if text_w <= target_w:
-                break
-            font_size -= 1
-
-        draw = ImageDraw.Draw(image)
-        x = (image.width - text_w) // 2
-        y = image.height - font_size - 2
-        draw.text((x, y), text, font=font, fill=TEXT_COLOUR)
+        size, x, y = _caption_layout(text, image.width, image.height,
+                                     font_size or DEFAULT_FONT_SIZE)
+        ImageDraw.Draw(image).text((x, y), text, font=_font(size), fill=TEXT_COLOUR)
+
+    @staticmethod
+    def font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+        """Shared DejaVuSans-Bold at *size* (falls back to Pillow's default)."""
+        return _font(size)
 
     # ------------------------------------------------------------------- #
     # Arrow primitive
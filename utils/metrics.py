@@ -0,0 +1,201 @@
+"""utils/metrics.py – in-process counters, timers and a /metrics endpoint
+
+• ``METRICS.inc(name)`` / ``METRICS.observe(name, seconds)`` record a
+  counter or a timing; optional keyword labels split a series
+  (``METRICS.inc("moves", outcome="fork")``).
+• ``METRICS.timer(name)`` is a context manager, ``METRICS.timed(name)``
+  a decorator for plain or async functions.
+• Timings keep a running count/sum plus the most recent ``window``
+  samples, so percentiles describe recent behaviour, not all-time.
+• ``register(prefix, fn)`` adds a callable returning {key: number}
+  (e.g. ``REFRESHER.stats``) that is read at scrape time.
+• ``serve(port)`` exposes everything as Prometheus text on
+  http://host:port/metrics (aiohttp, already a dependency).
+"""
+from __future__ import annotations
+
+import functools, inspect, time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Tuple
+
+from aiohttp import web
+
+# ---------------------------------------------------------------------------
+# Tunables
+# ---------------------------------------------------------------------------
+WINDOW    = 1024                      # recent samples kept per timing series
+QUANTILES = (0.5, 0.9, 0.99)
+PREFIX    = "tilerace_"               # Prometheus metric-name prefix
+
+Key = Tuple[str, Tuple[Tuple[str, str], ...]]      # (name, sorted labels)
+
+
+def _key(name: str, labels: Dict[str, object]) -> Key:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _percentile(sorted_vals: List[float], q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(int(q * len(sorted_vals)), len(sorted_vals) - 1)]
+
+
+class _Timing:
+    __slots__ = ("count", "total", "recent")
+
+    def __init__(self, window: int):
+        self.count  = 0
+        self.total  = 0.0
+        self.recent: Deque[float] = deque(maxlen=window)
+
+
+class Metrics:
+    def __init__(self, window: int = WINDOW):
+        self.window = window
+        self._counters: Dict[Key, float] = {}
+        self._timings:  Dict[Key, _Timing] = {}
+        self._sources:  Dict[str, Callable[[], Dict[str, float]]] = {}
+
+    # ------------------------------------------------------------------- #
+    # Recording
+    # ------------------------------------------------------------------- #
+    def inc(self, name: str, n: float = 1, **labels: object) -> None:
+        k = _key(name, labels)
+        self._counters[k] = self._counters.get(k, 0) + n
+
+    def observe(self, name: str, seconds: float, **labels: object) -> None:
+        k = _key(name, labels)
+        t = self._timings.get(k)
+        if t is None:
+            t = self._timings[k] = _Timing(self.window)
+        t.count += 1
+        t.total += seconds
+        t.recent.append(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels: object) -> Iterator[None]:
+        """Time the block; failures are timed too and counted as ``<name>_errors``."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.inc(f"{name}_errors", **labels)
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - t0, **labels)
+
+    def timed(self, name: str | None = None, **labels: object):
+        """Decorator: time every call of a plain or async function."""
+        def deco(fn):
+            series = name or fn.__name__
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def wrapper(*a, **kw):
+                    with self.timer(series, **labels):
+                        return await fn(*a, **kw)
+            else:
+                @functools.wraps(fn)
+                def wrapper(*a, **kw):
+                    with self.timer(series, **labels):
+                        return fn(*a, **kw)
+            return wrapper
+        return deco
+
+    def register(self, prefix: str, fn: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Read *fn()* at report time; each key becomes ``<prefix>_<key>``.
+        A nested {name: number} value becomes one series per name (label
+        ``key``); anything non-numeric is skipped.
+        """
+        self._sources[prefix] = fn
+
+    def _gauges(self) -> Iterator[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        for prefix, fn in sorted(self._sources.items()):
+            for k, v in sorted(fn().items()):
+                if isinstance(v, dict):
+                    for sub, n in sorted(v.items()):
+                        if isinstance(n, (int, float)):
+                            yield f"{prefix}_{k}", (("key", str(sub)),), n
+                elif isinstance(v, (int, float)):
+                    yield f"{prefix}_{k}", (), v
+
+    # ------------------------------------------------------------------- #
+    # Reporting
+    # ------------------------------------------------------------------- #
+    def percentiles(self) -> List[Dict[str, object]]:
+        """One row per timing series, slowest p99 first (milliseconds)."""
+        rows = []
+        for (name, labels), t in self._timings.items():
+            vals = sorted(t.recent)
+            rows.append({
+                "name":   name + "".join(f"[{v}]" for _, v in labels),
+                "count":  t.count,
+                **{f"p{int(q * 100)}": _percentile(vals, q) * 1000 for q in QUANTILES},
+                "max":    (vals[-1] if vals else 0.0) * 1000,
+            })
+        return sorted(rows, key=lambda r: r["p99"], reverse=True)
+
+    def counters(self) -> Dict[str, float]:
+        out = {name + "".join(f"[{v}]" for _, v in labels): n
+               for (name, labels), n in sorted(self._counters.items())}
+        for name, labels, v in self._gauges():
+            out[name + "".join(f"[{l}]" for _, l in labels)] = v
+        return out
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition format (0.0.4)."""
+        def fmt(labels: Tuple[Tuple[str, str], ...], extra: Dict[str, str] | None = None) -> str:
+            pairs = list(labels) + list((extra or {}).items())
+            if not pairs:
+                return ""
+            esc = lambda v: v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in pairs) + "}"
+
+        lines: List[str] = []
+        seen = set()
+        for (name, labels), n in sorted(self._counters.items()):
+            metric = f"{PREFIX}{name}_total"
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{fmt(labels)} {n:g}")
+
+        for (name, labels), t in sorted(self._timings.items()):
+            metric = f"{PREFIX}{name}_seconds"
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} summary")
+            vals = sorted(t.recent)
+            for q in QUANTILES:
+                lines.append(f"{metric}{fmt(labels, {'quantile': str(q)})} {_percentile(vals, q):.6f}")
+            lines.append(f"{metric}_sum{fmt(labels)} {t.total:.6f}")
+            lines.append(f"{metric}_count{fmt(labels)} {t.count}")
+
+        for name, labels, v in self._gauges():
+            metric = f"{PREFIX}{name}"
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric}{fmt(labels)} {float(v):g}")
+        return "\n".join(lines) + "\n"
+
+    # ------------------------------------------------------------------- #
+    # HTTP endpoint
+    # ------------------------------------------------------------------- #
+    async def serve(self, port: int, host: str = "127.0.0.1") -> web.AppRunner:
+        """Serve ``/metrics`` until the returned runner is cleaned up."""
+        async def _handler(_request: web.Request) -> web.Response:
+            return web.Response(text=self.prometheus(),
+                                content_type="text/plain", charset="utf-8")
+
+        app = web.Application()
+        app.router.add_get("/metrics", _handler)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        print(f"[METRICS] serving http://{host}:{port}/metrics")
+        return runner
+
+
+METRICS = Metrics()
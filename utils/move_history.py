@@ -0,0 +1,119 @@
+"""utils/move_history.py – bounded per-team move log
+
+• Every roll a team makes is one ``Move``: the tile it stood on, the path
+  actually walked, the dice and the action (approve / skip / reroll).
+• The last ``size`` moves are kept in a ring buffer (deque with maxlen),
+  so /reroll finds the previous spot and /undo restores it in O(1) on
+  any board shape – no arithmetic on tile IDs.
+• A fork is recorded when it is offered (path = just the origin) and
+  ``resolve()``-d with the chosen path once the team picks.
+• Running totals (moves, tiles walked, per action, forks, undos) are kept
+  alongside, so /stats never re-simulates the game.
+• ``to_state()`` / ``from_state()`` give a compact JSON form for
+  utils/state_store.
+"""
+from __future__ import annotations
+
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List
+
+# ---------------------------------------------------------------------------
+# Tunables
+# ---------------------------------------------------------------------------
+HISTORY_SIZE = 16             # moves kept per team (persisted with every event)
+
+
+@dataclass(slots=True)
+class Move:
+    before: str               # where the team stood when the action started
+    path:   List[str]         # walked tiles, origin first; [origin] while a fork is open
+    dice:   int
+    action: str
+    fork:   bool = False      # destination was picked from several
+
+    @property
+    def origin(self) -> str:
+        return self.path[0]
+
+    @property
+    def dest(self) -> str:
+        return self.path[-1]
+
+    @property
+    def steps(self) -> int:
+        return len(self.path) - 1
+
+
+class MoveHistory:
+    def __init__(self, size: int = HISTORY_SIZE):
+        self.moves: Deque[Move] = deque(maxlen=size)
+        self.totals: Counter = Counter()     # moves, steps, dice, forks, undos, <action>
+
+    # ------------------------------------------------------------------- #
+    # Updates
+    # ------------------------------------------------------------------- #
+    def record(self, before: str, path: List[str], dice: int, action: str) -> Move:
+        move = Move(before, list(path), dice, action)
+        self.moves.append(move)
+        self.totals.update({"moves": 1, "steps": move.steps, "dice": dice, action: 1})
+        return move
+
+    def resolve(self, path: List[str], *, fork: bool = True) -> None:
+        """
+        Fill in the path of the open fork (the latest move); *fork*=False
+        when no choice was left to the team (the board changed meanwhile).
+        """
+        move = self.moves[-1]
+        self.totals["steps"] += len(path) - 1 - move.steps
+        self.totals["forks"] += int(fork)
+        move.path = list(path)
+        move.fork = fork
+
+    def undo(self, *, counted: bool = True) -> Move | None:
+        """
+        Drop the latest move and take it out of the totals; *counted*=False
+        for a rollback the players never saw (not an undo in /stats).
+        """
+        if not self.moves:
+            return None
+        move = self.moves.pop()
+        self.totals.subtract({"moves": 1, "steps": move.steps, "dice": move.dice,
+                              move.action: 1, "forks": int(move.fork)})
+        if counted:
+            self.totals["undos"] += 1
+        return move
+
+    # ------------------------------------------------------------------- #
+    # Queries
+    # ------------------------------------------------------------------- #
+    def last(self) -> Move | None:
+        return self.moves[-1] if self.moves else None
+
+    def stats(self) -> Dict[str, Any]:
+        t = self.totals
+        return {
+            "moves":   t["moves"],
+            "steps":   t["steps"],
+            "avg_roll": round(t["dice"] / t["moves"], 2) if t["moves"] else 0.0,
+            "forks":   t["forks"],
+            "undos":   t["undos"],
+            "actions": {a: t[a] for a in ("approve", "skip", "reroll") if t[a]},
+        }
+
+    # ------------------------------------------------------------------- #
+    # Persistence
+    # ------------------------------------------------------------------- #
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "moves":  [[m.action, m.dice, m.path, m.before, m.fork] for m in self.moves],
+            "totals": {k: v for k, v in self.totals.items() if v},
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any] | None, size: int = HISTORY_SIZE) -> "MoveHistory":
+        hist = cls(size)
+        for action, dice, path, before, fork in (state or {}).get("moves", []):
+            hist.moves.append(Move(before, path, dice, action, fork))
+        hist.totals.update((state or {}).get("totals", {}))
+        return hist
@@ -0,0 +1,156 @@
+"""utils/move_index.py – precomputed exact-distance move table
+
+• For every tile and every roll 1‥MAX_ROLL, stores the reachable
+  destinations plus one representative simple path to each.
+• Must-hit tiles are part of the table: a walk that reaches one before
+  the roll is used up stops there, so it is a destination for that roll
+  and every larger one (with the shorter path). Enforcing the rule costs
+  nothing per roll.
+• Built once per graph; a roll is then a dict lookup instead of an
+  ``nx.all_simple_paths`` sweep over every node.
+• ``sync()`` diffs a new edge set (and must-hit set) against the index
+  and only rewalks the tiles whose moves can actually change.
+"""
+from __future__ import annotations
+
+from typing import Dict, Any, Iterable, List, Set, Tuple
+
+import networkx as nx
+
+# ---------------------------------------------------------------------------
+# Tunables
+# ---------------------------------------------------------------------------
+MAX_ROLL = 4              # GameUtils.roll_dice(3, True) → 1‥3, bonus 4
+
+Edge = Tuple[str, str]
+
+
+def tile_edges(tiles: Dict[str, Dict[str, Any]]) -> Set[Edge]:
+    """Return every (tile, next) edge declared in *tiles*."""
+    return {(tid, nxt) for tid, td in tiles.items() for nxt in td.get("next", [])}
+
+
+def must_hit_tiles(tiles: Dict[str, Dict[str, Any]]) -> Set[str]:
+    """Return every tile flagged ``must-hit``."""
+    return {tid for tid, td in tiles.items() if td.get("must-hit")}
+
+
+def build_graph(tiles: Dict[str, Dict[str, Any]]) -> nx.DiGraph:
+    graph = nx.DiGraph()
+    graph.add_edges_from(tile_edges(tiles))
+    return graph
+
+
+class MoveIndex:
+    """tile → roll → {destination: path} lookup table for one DiGraph."""
+
+    def __init__(self, graph: nx.DiGraph, max_roll: int = MAX_ROLL,
+                 must_hit: Iterable[str] = ()):
+        self.graph    = graph
+        self.max_roll = max_roll
+        self.must_hit: Set[str] = set(must_hit)
+        self._table: Dict[str, Dict[int, Dict[str, List[str]]]] = {}
+        self.rebuild()
+
+    # ------------------------------------------------------------------- #
+    # Lookups
+    # ------------------------------------------------------------------- #
+    def paths(self, tile: str, roll: int) -> Dict[str, List[str]]:
+        """
+        {destination: representative path} for a roll of *roll* from
+        *tile*; a path is shorter than *roll* when it ends on a must-hit.
+        """
+        return self._table.get(tile, {}).get(roll, {})
+
+    def destinations(self, tile: str, roll: int) -> List[str]:
+        return list(self.paths(tile, roll))
+
+    # ------------------------------------------------------------------- #
+    # Building
+    # ------------------------------------------------------------------- #
+    def rebuild(self) -> None:
+        """Walk every node from scratch."""
+        self._table = {n: self._walk(n) for n in self.graph.nodes}
+
+    def sync(self, edges: Iterable[Edge], must_hit: Iterable[str] | None = None) -> Set[str]:
+        """
+        Make the graph match *edges* (and the must-hit set match *must_hit*,
+        if given) and refresh only the affected tiles.
+        Returns the set of tiles whose move table was recomputed.
+        """
+        new_edges = set(edges)
+        old_edges = set(self.graph.edges)
+        added, removed = new_edges - old_edges, old_edges - new_edges
+        flipped: Set[str] = set()
+        if must_hit is not None:
+            must_hit = set(must_hit)
+            flipped  = must_hit ^ self.must_hit
+            self.must_hit = must_hit
+        if not added and not removed and not flipped:
+            return set()
+
+        self.graph.remove_edges_from(removed)
+        self.graph.add_edges_from(added)
+        self.graph.remove_nodes_from([n for n in list(self.graph.nodes)
+                                     if self.graph.degree(n) == 0])
+
+        # a flag only matters to walks that pass the tile, i.e. the same
+        # predecessors as a change to its out-edges
+        changed = {u for u, _ in added | removed} | flipped
+        return self.update(changed)
+
+    def update(self, changed: Iterable[str]) -> Set[str]:
+        """
+        Recompute every tile that can reach a *changed* tile (one whose
+        out-edges or must-hit flag differ) in fewer than ``max_roll`` steps.
+        """
+        affected: Set[str] = set()
+        frontier = [n for n in changed if n in self.graph]
+        affected.update(frontier)
+        for _ in range(self.max_roll - 1):
+            nxt = []
+            for n in frontier:
+                for pred in self.graph.predecessors(n):
+                    if pred not in affected:
+                        affected.add(pred)
+                        nxt.append(pred)
+            frontier = nxt
+
+        for gone in [n for n in self._table if n not in self.graph]:
+            del self._table[gone]
+        for n in self.graph.nodes:
+            if n in affected or n not in self._table:
+                self._table[n] = self._walk(n)
+                affected.add(n)
+        return affected
+
+    def _walk(self, src: str) -> Dict[int, Dict[str, List[str]]]:
+        """
+        DFS over simple paths of length ≤ max_roll starting at *src*,
+        cut short at must-hit tiles (the start tile itself doesn't count).
+        """
+        moves: Dict[int, Dict[str, List[str]]] = {r: {} for r in range(1, self.max_roll + 1)}
+        path = [src]
+        on_path = {src}
+
+        def _dfs(node: str) -> None:
+            depth = len(path) - 1
+            if depth and node in self.must_hit:
+                for roll in range(depth, self.max_roll + 1):   # any roll ≥ depth stops here
+                    moves[roll].setdefault(node, list(path))
+                return
+            if depth:
+                moves[depth].setdefault(node, list(path))
+            if depth == self.max_roll:
+                return
+            for nxt in self.graph.successors(node):
+                if nxt in on_path:
+                    continue
+                path.append(nxt)
+                on_path.add(nxt)
+                _dfs(nxt)
+                on_path.discard(nxt)
+                path.pop()
+
+        _dfs(src)
+        return moves
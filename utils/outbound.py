@@ -0,0 +1,187 @@
+"""utils/outbound.py – per-channel outbound message queue
+
+• ``post(channel_id, text)`` enqueues a status line and returns a future
+  for the message it ends up in; callers that don't need the message
+  can ignore it.
+• One FIFO lane per channel, drained by a single worker, so lines go out
+  in the order they were posted (and therefore in order per team).
+• Each lane has a token bucket sized to Discord's per-channel send limit
+  (5 messages / 5 s). The worker waits for a token *before* taking lines,
+  so while it waits, consecutive batchable lines pile up and go out as
+  one message of up to ``MAX_CHARS`` characters. A ``tail=True`` line
+  (a prompt that gets reactions) may close a batch but nothing is added
+  after it; ``batch=False`` lines and lines with a file always get a
+  message of their own.
+• Transient failures are retried with backoff; 400/403/404 and the last
+  retry fail the futures, log a warning and count as ``failures`` rather
+  than vanishing inside a fire-and-forget task.
+• ``stats()`` reports depth per channel and totals; enqueue → send wait
+  is recorded in utils/metrics as ``outbound_wait``.
+"""
+from __future__ import annotations
+
+import asyncio, time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List
+
+from utils.metrics import METRICS
+
+# ---------------------------------------------------------------------------
+# Tunables
+# ---------------------------------------------------------------------------
+MAX_CHARS     = 2000          # Discord message content limit
+BUCKET_SIZE   = 5             # sends allowed per BUCKET_PERIOD per channel
+BUCKET_PERIOD = 5.0           # seconds
+RETRIES       = 3
+RETRY_DELAY   = 1.0           # seconds, doubled per attempt
+FATAL_STATUS  = {400, 403, 404}
+
+
+@dataclass
+class _Item:
+    text:     str
+    kind:     str                                   # "line" | "tail" | "solo"
+    future:   asyncio.Future
+    file:     Callable[[], Any] | None = None       # fresh discord.File per attempt
+    enqueued: float = field(default_factory=time.monotonic)
+
+
+class _Bucket:
+    """Token bucket; ``take()`` returns how long to wait (0 → go)."""
+
+    def __init__(self, size: int, period: float):
+        self.size   = size
+        self.rate   = size / period
+        self.tokens = float(size)
+        self.stamp  = time.monotonic()
+
+    def take(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.size, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp  = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class _Lane:
+    def __init__(self, size: int, period: float):
+        self.queue:  Deque[_Item] = deque()
+        self.bucket = _Bucket(size, period)
+        self.task:   asyncio.Task | None = None
+
+
+class Outbox:
+    def __init__(self, get_channel: Callable[[int], Any], *,
+                 bucket_size: int = BUCKET_SIZE, bucket_period: float = BUCKET_PERIOD):
+        self._get_channel = get_channel
+        self._size   = bucket_size
+        self._period = bucket_period
+        self._lanes: Dict[int, _Lane] = {}
+
+        # counters
+        self.lines    = 0
+        self.sent     = 0
+        self.batched  = 0             # lines that rode along in someone else's message
+        self.retries  = 0
+        self.failures = 0
+
+    # ------------------------------------------------------------------- #
+    # Public API
+    # ------------------------------------------------------------------- #
+    def post(self, channel_id: int, text: str, *, batch: bool = True, tail: bool = False,
+             file: Callable[[], Any] | None = None) -> asyncio.Future:
+        """
+        Queue *text*; the future resolves to the message that carried it.
+        *file* is a factory (a discord.File can only be sent once).
+        """
+        kind = "solo" if file is not None or not batch else "tail" if tail else "line"
+        lane = self._lanes.get(channel_id)
+        if lane is None:
+            lane = self._lanes[channel_id] = _Lane(self._size, self._period)
+        fut = asyncio.get_running_loop().create_future()
+        lane.queue.append(_Item(text, kind, fut, file))
+        self.lines += 1
+        if lane.task is None or lane.task.done():
+            lane.task = asyncio.create_task(self._run(channel_id, lane))
+        return fut
+
+    async def drain(self) -> None:
+        """Wait until every queued line has been sent (or has failed)."""
+        while True:
+            busy = [l.task for l in self._lanes.values() if l.task and not l.task.done()]
+            if not busy:
+                return
+            await asyncio.gather(*busy, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth":    {cid: len(l.queue) for cid, l in self._lanes.items()},
+            "lines":    self.lines,
+            "sent":     self.sent,
+            "batched":  self.batched,
+            "retries":  self.retries,
+            "failures": self.failures,
+        }
+
+    # ------------------------------------------------------------------- #
+    # Worker
+    # ------------------------------------------------------------------- #
+    async def _run(self, channel_id: int, lane: _Lane) -> None:
+        while lane.queue:
+            while (wait := lane.bucket.take()) > 0:
+                await asyncio.sleep(wait)           # lines keep queueing meanwhile
+            await self._send(channel_id, self._take(lane))
+
+    @staticmethod
+    def _take(lane: _Lane) -> List[_Item]:
+        """Next item, plus following lines (and at most one tail) that still fit."""
+        items = [lane.queue.popleft()]
+        if items[0].kind != "line":
+            return items
+        size = len(items[0].text)
+        while lane.queue and lane.queue[0].kind != "solo":
+            nxt = len(lane.queue[0].text) + 1       # + newline
+            if size + nxt > MAX_CHARS:
+                break
+            size += nxt
+            items.append(lane.queue.popleft())
+            if items[-1].kind == "tail":
+                break
+        return items
+
+    async def _send(self, channel_id: int, items: List[_Item]) -> None:
+        text = "\n".join(i.text for i in items)
+        now = time.monotonic()
+        for i in items:
+            METRICS.observe("outbound_wait", now - i.enqueued)
+
+        for attempt in range(RETRIES + 1):
+            try:
+                extra = {"file": items[0].file()} if items[0].file else {}
+                with METRICS.timer("discord_send"):
+                    msg = await self._get_channel(channel_id).send(text, **extra)
+                break
+            except Exception as e:
+                if getattr(e, "status", None) in FATAL_STATUS or attempt == RETRIES:
+                    self._fail(channel_id, items, e)
+                    return
+                self.retries += 1
+                await asyncio.sleep(RETRY_DELAY * 2 ** attempt)
+
+        self.sent    += 1
+        self.batched += len(items) - 1
+        for i in items:
+            if not i.future.done():
+                i.future.set_result(msg)
+
+    def _fail(self, channel_id: int, items: List[_Item], exc: Exception) -> None:
+        self.failures += len(items)
+        METRICS.inc("outbound_failures", len(items))
+        print(f"[WARN] couldn't send {len(items)} line(s) to channel {channel_id}: {exc!r}")
+        for i in items:
+            if not i.future.done():
+                i.future.set_exception(exc)
+                i.future.exception()                # logged above; don't warn again on GC
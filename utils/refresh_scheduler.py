@@ -0,0 +1,97 @@
+"""utils/refresh_scheduler.py – debounced, coalescing board refresh
+
+• ``request()`` is fire-and-forget: it marks the board dirty and returns.
+• The refresh runs once the board has been quiet for ``quiet`` seconds,
+  but never later than ``max_delay`` seconds after the first request
+  of a burst, so a steady stream of approvals still shows up.
+• Requests that arrive while a refresh is running trigger one more
+  refresh afterwards; nothing is lost.
+• ``flush()`` waits for the next refresh to *start* and finish, not for
+  the worker to go idle, so it returns promptly under steady traffic.
+"""
+from __future__ import annotations
+
+import asyncio, time
+from typing import Awaitable, Callable, Dict, List
+
+
+class RefreshScheduler:
+    def __init__(self, refresh: Callable[[], Awaitable[None]], *,
+                 quiet: float = 1.5, max_delay: float = 6.0):
+        self._refresh  = refresh
+        self.quiet     = quiet
+        self.max_delay = max_delay
+
+        self._first: float | None = None      # first request of current burst
+        self._last:  float = 0.0              # most recent request
+        self._pending = 0                     # requests in current burst
+        self._kick = asyncio.Event()          # flush() → skip the wait
+        self._task: asyncio.Task | None = None
+        self._waiters: List[asyncio.Future] = []   # flush() callers for the next refresh
+
+        # counters
+        self.requested = 0
+        self.refreshes = 0
+        self.coalesced = 0
+        self.failures  = 0
+
+    # ------------------------------------------------------------------- #
+    # Public API
+    # ------------------------------------------------------------------- #
+    def request(self) -> None:
+        """Mark the board dirty; a refresh will follow shortly."""
+        now = time.monotonic()
+        self.requested += 1
+        self._pending  += 1
+        self._last      = now
+        if self._first is None:
+            self._first = now
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def flush(self) -> None:
+        """Refresh now (merging anything pending) and wait until it's done."""
+        done = asyncio.get_running_loop().create_future()
+        self._waiters.append(done)
+        self.request()
+        self._kick.set()
+        await done
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "requested": self.requested,
+            "refreshes": self.refreshes,
+            "coalesced": self.coalesced,
+            "failures":  self.failures,
+            "pending":   self._pending,
+        }
+
+    # ------------------------------------------------------------------- #
+    # Worker
+    # ------------------------------------------------------------------- #
+    async def _run(self) -> None:
+        while self._first is not None:
+            deadline = min(self._last + self.quiet, self._first + self.max_delay)
+            delay = deadline - time.monotonic()
+            if delay > 0 and not self._kick.is_set():
+                try:
+                    await asyncio.wait_for(self._kick.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue                      # re-check: more requests may have landed
+
+            batch = self._pending
+            self._first, self._pending = None, 0
+            waiters, self._waiters = self._waiters, []   # later flushes wait for the next one
+            self._kick.clear()
+            self.refreshes += 1
+            self.coalesced += batch - 1
+            try:
+                await self._refresh()
+            except Exception as e:            # keep the scheduler alive
+                self.failures += 1
+                print(f"[WARN] board refresh failed: {e!r}")
+            finally:
+                for w in waiters:
+                    if not w.done():          # caller may have been cancelled
+                        w.set_result(None)
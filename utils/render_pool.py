@@ -0,0 +1,86 @@
+"""utils/render_pool.py – run the Pillow board pipeline off the event loop
+
+• Small boards render on a worker thread (Pillow releases the GIL for
+  most of resize/composite/encode).
+• Boards with at least RENDER_PROCESS_TILES tiles render in a worker
+  process so a long encode can't starve the gateway heartbeat.
+• Each pool has a single worker: renders are serialised anyway, and one
+  long-lived worker keeps its static-layer cache warm.
+• Workers send back per-stage timings, recorded here as
+  ``render_stage[<stage>]`` in utils/metrics (the process pool's own
+  metrics would otherwise never reach the bot).
+"""
+from __future__ import annotations
+
+import asyncio, os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, Tuple
+
+from utils.board import board_png_bytes, overview_png_bytes, viewport_png_bytes
+from utils.board_model import BoardModel
+from utils.metrics import METRICS
+
+# ---------------------------------------------------------------------------
+# Tunables
+# ---------------------------------------------------------------------------
+PROCESS_POOL_TILES = int(os.getenv("RENDER_PROCESS_TILES", "250"))
+
+_threads: ThreadPoolExecutor | None  = None
+_procs:   ProcessPoolExecutor | None = None
+
+
+def _executor(n_tiles: int) -> Executor:
+    global _threads, _procs
+    if n_tiles >= PROCESS_POOL_TILES:
+        if _procs is None:
+            _procs = ProcessPoolExecutor(max_workers=1)
+        return _procs
+    if _threads is None:
+        _threads = ThreadPoolExecutor(max_workers=1, thread_name_prefix="board-render")
+    return _threads
+
+
+def _timed(fn, model: BoardModel, tokens: Dict[str, Dict[str, Any]],
+           *args: Any) -> Tuple[bytes, Dict[str, float]]:
+    """Runs in the worker: the image plus seconds per stage."""
+    timings: Dict[str, float] = {}
+    return fn(model, tokens, *args, timings=timings), timings
+
+
+async def _run(fn, model: BoardModel,
+               teams: Dict[str, Dict[str, Any]] | None, *args: Any) -> bytes:
+    # snapshot positions now – the event loop keeps mutating `teams`
+    tokens = {n: {"tile": d["tile"]} for n, d in (teams or {}).items()}
+    loop = asyncio.get_running_loop()
+    ex   = _executor(len(model))
+    with METRICS.timer("render", pool="process" if ex is _procs else "thread"):
+        png, timings = await loop.run_in_executor(ex, _timed, fn, model, tokens, *args)
+    for stage, seconds in timings.items():
+        METRICS.observe("render_stage", seconds, stage=stage)
+    return png
+
+
+async def render_board_png(model: BoardModel,
+                           teams: Dict[str, Dict[str, Any]] | None = None) -> bytes:
+    """Render the board in an executor and return PNG bytes."""
+    return await _run(board_png_bytes, model, teams)
+
+
+async def render_viewport_png(model: BoardModel, teams: Dict[str, Dict[str, Any]] | None,
+                              tile: str, radius: int = 3) -> bytes:
+    """Cropped view of *radius* cells around *tile*."""
+    return await _run(viewport_png_bytes, model, teams, tile, radius)
+
+
+async def render_overview_png(model: BoardModel, teams: Dict[str, Dict[str, Any]] | None,
+                              max_side: int = 2048) -> bytes:
+    """Whole board downscaled to fit *max_side* px."""
+    return await _run(overview_png_bytes, model, teams, max_side)
+
+
+def shutdown() -> None:
+    global _threads, _procs
+    for ex in (_threads, _procs):
+        if ex is not None:
+            ex.shutdown(wait=False, cancel_futures=True)
+    _threads = _procs = None
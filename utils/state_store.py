@@ -0,0 +1,185 @@
+"""utils/state_store.py – crash-safe persistence for live team state
+
+• Every change to a team is appended to ``events.jsonl`` as one JSON line
+  holding that team's full mutable state (so replay is idempotent).
+• Writes are flushed immediately but fsync'd in batches: after
+  ``fsync_every`` events or ``fsync_interval`` seconds, whichever is first
+  (a timer on the running event loop covers the last write of a burst).
+• Every ``snapshot_every`` events the latest state of all teams is written
+  atomically to ``snapshot.json`` and the log is truncated, so startup
+  replays at most one snapshot interval of events.
+• Field values with a ``to_state()`` method (utils/move_history) are
+  stored in that JSON form; the caller rebuilds them after ``restore``.
+"""
+from __future__ import annotations
+
+import asyncio, json, os, time
+from pathlib import Path
+from typing import Dict, Any, IO
+
+# ---------------------------------------------------------------------------
+# Tunables
+# ---------------------------------------------------------------------------
+STATE_FIELDS = ("tile", "rerolls", "skips", "last_roll", "pending_paths", "pending_message",
+                "history")
+
+
+def _fields(team: Dict[str, Any]) -> Dict[str, Any]:
+    """*team*'s persisted fields, as plain JSON values."""
+    return {k: (team[k].to_state() if hasattr(team[k], "to_state") else team[k])
+            for k in STATE_FIELDS if k in team}
+
+
+class StateStore:
+    def __init__(self, root: Path, *, snapshot_every: int = 200,
+                 fsync_every: int = 16, fsync_interval: float = 1.0):
+        self.root           = Path(root)
+        self.snapshot_every = snapshot_every
+        self.fsync_every    = fsync_every
+        self.fsync_interval = fsync_interval
+
+        self.snapshot_path = self.root / "snapshot.json"
+        self.log_path      = self.root / "events.jsonl"
+
+        self._state: Dict[str, Dict[str, Any]] = {}   # team → latest fields
+        self._seq        = 0
+        self._since_snap = 0
+        self._unsynced   = 0
+        self._last_sync  = time.monotonic()
+        self._log: IO[str] | None = None
+        self._timer: asyncio.TimerHandle | None = None   # pending delayed sync()
+
+    # ------------------------------------------------------------------- #
+    # Startup
+    # ------------------------------------------------------------------- #
+    def restore(self, teams: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Load snapshot + replay the log into *teams* (in place).
+        Teams not in *teams* are ignored. Returns the number of events replayed.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        snap_seq = 0
+        if self.snapshot_path.is_file():
+            snap = json.loads(self.snapshot_path.read_text("utf-8"))
+            snap_seq    = int(snap.get("seq", 0))
+            self._state = snap.get("teams", {})
+
+        replayed = 0
+        if self.log_path.is_file():
+            with self.log_path.open(encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        ev = json.loads(line)
+                    except json.JSONDecodeError:
+                        print(f"[WARN] state log: dropping torn tail in {self.log_path}")
+                        break
+                    if ev["seq"] <= snap_seq:
+                        continue                  # already folded into snapshot
+                    self._state[ev["team"]] = ev["state"]
+                    snap_seq = ev["seq"]
+                    replayed += 1
+
+        self._seq        = snap_seq
+        self._since_snap = replayed
+        for name, fields in self._state.items():
+            if name in teams:
+                teams[name].update(fields)
+                for k in ("pending_paths", "pending_message"):
+                    if k not in fields:
+                        teams[name].pop(k, None)
+
+        # start from a clean log so a torn tail can't hide later appends
+        self.snapshot()
+        print(f"[STATE] restored {len(self._state)} teams, replayed {replayed} events")
+        return replayed
+
+    # ------------------------------------------------------------------- #
+    # Writes
+    # ------------------------------------------------------------------- #
+    def record(self, name: str, team: Dict[str, Any]) -> None:
+        """Append *team*'s current state to the log."""
+        fields = _fields(team)
+        self._seq += 1
+        self._state[name] = fields
+
+        log = self._open_log()
+        log.write(json.dumps({"seq": self._seq, "ts": time.time(),
+                              "team": name, "state": fields},
+                             ensure_ascii=False) + "\n")
+        log.flush()
+        self._unsynced   += 1
+        self._since_snap += 1
+
+        if self._since_snap >= self.snapshot_every:
+            self.snapshot()
+        elif (self._unsynced >= self.fsync_every
+              or time.monotonic() - self._last_sync >= self.fsync_interval):
+            self.sync()
+        elif self._timer is None:
+            self._sync_later()
+
+    def replace(self, teams: Dict[str, Dict[str, Any]]) -> None:
+        """Forget previous state and snapshot *teams* as the new baseline."""
+        self._state = {n: _fields(d) for n, d in teams.items()}
+        self._seq += 1
+        self.snapshot()
+
+    def sync(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._log is not None and self._unsynced:
+            os.fsync(self._log.fileno())
+        self._unsynced  = 0
+        self._last_sync = time.monotonic()
+
+    def snapshot(self) -> None:
+        """Atomically write all team state, then truncate the log."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.snapshot_path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            json.dump({"seq": self._seq, "teams": self._state}, fh, ensure_ascii=False)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.snapshot_path)
+
+        if self._log is not None:
+            self._log.close()
+        self._log = self.log_path.open("w", encoding="utf-8")
+        self._fsync_dir()
+        self._since_snap = 0
+        self._unsynced   = 0
+        self._last_sync  = time.monotonic()
+
+    def close(self) -> None:
+        self.sync()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    # ------------------------------------------------------------------- #
+    # Internals
+    # ------------------------------------------------------------------- #
+    def _sync_later(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return                               # no loop (startup, tools) – next write or close()
+        self._timer = loop.call_later(self.fsync_interval, self.sync)
+
+    def _open_log(self) -> IO[str]:
+        if self._log is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._log = self.log_path.open("a", encoding="utf-8")
+        return self._log
+
+    def _fsync_dir(self) -> None:
+        try:
+            fd = os.open(self.root, os.O_RDONLY)
+        except OSError:
+            return                               # e.g. Windows – best effort
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
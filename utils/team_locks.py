@@ -0,0 +1,72 @@
+"""utils/team_locks.py – per-team move serialisation
+
+• One asyncio.Lock per team: moves for the same team run strictly in
+  arrival order (asyncio.Lock is FIFO), different teams run in parallel.
+• ``seen()`` is a bounded set of already-handled keys, used to drop a
+  second ✅ on a drop that was already approved; ``forget()`` releases a
+  key whose handling failed so it can be retried.
+• Tracks queue depth (waiting + running) per team for metrics.
+"""
+from __future__ import annotations
+
+import asyncio, functools
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class TeamLocks:
+    def __init__(self, dedupe_size: int = 4096):
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._depth: Dict[str, int] = defaultdict(int)
+        self._seen: "OrderedDict[Hashable, None]" = OrderedDict()
+        self._dedupe_size = dedupe_size
+
+        self.max_depth  = 0
+        self.moves      = 0
+        self.duplicates = 0
+
+    @asynccontextmanager
+    async def hold(self, team: str) -> AsyncIterator[None]:
+        """Exclusive section for *team*; waits behind earlier moves."""
+        lock = self._locks.setdefault(team, asyncio.Lock())
+        self._depth[team] += 1
+        self.max_depth = max(self.max_depth, self._depth[team])
+        try:
+            async with lock:
+                self.moves += 1
+                yield
+        finally:
+            self._depth[team] -= 1
+
+    def serialized(self, fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        """Decorator: run ``fn(tname, ...)`` under ``hold(tname)``."""
+        @functools.wraps(fn)
+        async def _wrapped(tname: str, *args: Any, **kwargs: Any) -> T:
+            async with self.hold(tname):
+                return await fn(tname, *args, **kwargs)
+        return _wrapped
+
+    def seen(self, key: Hashable) -> bool:
+        """True if *key* was already handled; otherwise remember it."""
+        if key in self._seen:
+            self.duplicates += 1
+            return True
+        self._seen[key] = None
+        while len(self._seen) > self._dedupe_size:
+            self._seen.popitem(last=False)
+        return False
+
+    def forget(self, key: Hashable) -> None:
+        """Un-see *key*, e.g. after the action it guarded raised."""
+        self._seen.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth":      {t: d for t, d in self._depth.items() if d},
+            "max_depth":  self.max_depth,
+            "moves":      self.moves,
+            "duplicates": self.duplicates,
+        }